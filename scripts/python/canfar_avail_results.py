@@ -12,8 +12,6 @@ Check whether results files are available on vos.
 import re
 import os
 import sys
-import glob
-import copy
 import io
 from contextlib import redirect_stdout
 
@@ -129,17 +127,9 @@ def update_param(p_def, options):
         updated paramter values
     """
 
-    param = copy.copy(p_def)
-
-    # Update keys in param according to options values
-    for key in vars(param):
-        if key in vars(options):
-            setattr(param, key, getattr(options, key))
-
-    # Add remaining keys from options to param
-    for key in vars(options):
-        if not key in vars(param):
-            setattr(param, key, getattr(options, key))
+    # Update default values with options, and add remaining keys
+    # from options to param
+    param = type(p_def)(**{**vars(p_def), **vars(options)})
 
     # Do extra stuff if necessary
 
@@ -163,13 +153,22 @@ def read_input_files(input_path, verbose=False):
     """
 
     if os.path.isdir(input_path):
-        input_files = glob.glob('{}/*'.format(input_path))
+        # Directory entries carry their file type, no stat call needed
+        with os.scandir(input_path) as entries:
+            input_files = [
+                (entry.path, entry.is_dir())
+                for entry in entries
+                if not entry.name.startswith('.')
+            ]
     else:
-        input_files =  cfis.my_string_split(input_path, stop=True, sep=' ')
+        input_files = [
+            (f, os.path.isdir(f))
+            for f in cfis.my_string_split(input_path, stop=True, sep=' ')
+        ]
 
     ID_files = []
-    for f in input_files:
-        if os.path.isdir(f):
+    for f, is_dir in input_files:
+        if is_dir:
             if verbose:
                 print('Skipping directory \'{}\''.format(f))
         else:
@@ -210,9 +209,15 @@ def check_results(ID_files, input_path, result_base_names, n_complete, extension
     m = re.match('vos:', input_path)
     if m:
         ls_tmp = dir_list(input_path)
+        ls_out = [os.path.basename(path) for path in ls_tmp]
     else:
-        ls_tmp = glob.glob(f'{input_path}/*')
-    ls_out = [os.path.basename(path) for path in ls_tmp]
+        # Only file names are needed, list them directly
+        ls_out = [
+            name for name in os.listdir(input_path)
+            if not name.startswith('.')
+        ]
+    # Set for fast membership tests
+    ls_out = set(ls_out)
 
     n_found = {}
     n_IDs = {}
@@ -238,7 +243,7 @@ def check_results(ID_files, input_path, result_base_names, n_complete, extension
                     ID_fname = f'_{ID}'
                 # Count how many result files are available
                 for base in result_base_names:
-                    name = '{}{}.{}'.format(base, ID_fname, extension)
+                    name = f'{base}{ID_fname}.{extension}'
                     if name in ls_out:
                         n_found[ID_list][ID] = n_found[ID_list][ID] + 1
                 n_IDs[ID_list] = n_IDs[ID_list] + 1
@@ -11,23 +11,14 @@ Handling and selecting CFIS fields and pointings.
 """
 
 
-# Compability with python2.x for x>6
-from __future__ import print_function
-
 import sys
 import os
 import re
-import copy
-import glob
-
-import numpy as np
-import pylab as plt
 
-from optparse import OptionParser, IndentedHelpFormatter, OptionGroup
+from argparse import ArgumentParser
 
 from astropy.io import fits
-from astropy import units
-from astropy.coordinates import Angle, SkyCoord
+from astropy.coordinates import Angle
 
 from shapepipe.utilities import cfis
 
@@ -173,63 +164,61 @@ def parse_options(p_def):
 
     Returns
     -------
-    options: tuple
+    options: argparse.Namespace
         Command line options
-    args: string
-        Command line string
     """
 
-    usage  = "%prog [OPTIONS]"
-    parser = OptionParser(usage=usage)
+    usage  = "%(prog)s [OPTIONS]"
+    parser = ArgumentParser(usage=usage)
 
     # I/O
-    parser.add_option('-i', '--input', dest='input', type='string', default=p_def.input,
+    parser.add_argument('-i', '--input', dest='input', default=p_def.input,
          help='input image list, can be ascii file or directory path')
-    parser.add_option('-c', '--column', dest='col', type='string', default=None,
+    parser.add_argument('-c', '--column', dest='col', default=None,
          help='column name if input is file, default=file has only one column)')
-    parser.add_option('', '--input_format', dest='input_format', type='string',
+    parser.add_argument('--input_format', dest='input_format',
          default=p_def.input_format,
          help='input format, one of \'full\', \'ID_only\', default=\'{}\''.format(p_def.input_format))
-    parser.add_option('-o', '--outbase', dest='outbase', type='string', default=None,
+    parser.add_argument('-o', '--outbase', dest='outbase', default=None,
          help='output file name base (\'.txt\' is added), default=stdout')
-    parser.add_option('', '--plot', dest='plot', action='store_true',
+    parser.add_argument('--plot', dest='plot', action='store_true',
          help='create plots')
-    parser.add_option('', '--out_base_name', dest='out_base_name', action='store_true',
+    parser.add_argument('--out_base_name', dest='out_base_name', action='store_true',
          help='output base names, not entire path if input is directory')
-    parser.add_option('', '--out_name_only', dest='out_name_only', action='store_true',
+    parser.add_argument('--out_name_only', dest='out_name_only', action='store_true',
          help='output only file names, not coordinates and metainfo')
-    parser.add_option('', '--out_ID_only', dest='out_ID_only', action='store_true',
+    parser.add_argument('--out_ID_only', dest='out_ID_only', action='store_true',
          help='output only file IDs, not full file names')
-    parser.add_option('', '--interactive', dest='interactive', action='store_true',
+    parser.add_argument('--interactive', dest='interactive', action='store_true',
          help='interactive mode (showing plots, recommended for call from jupyer notebook)')
-    parser.add_option('-s', '--short', dest='short', action='store_true', help='short output')
+    parser.add_argument('-s', '--short', dest='short', action='store_true', help='short output')
 
     # Job control
-    parser.add_option('', '--no_cuts', dest='no_cuts', action='store_true',
+    parser.add_argument('--no_cuts', dest='no_cuts', action='store_true',
         help='output all exposures, no cuts (default: cut short and invalid exposures)')
 
     # Field and image options
-    parser.add_option('-b', '--band', dest='band', type='string', default=p_def.band,
+    parser.add_argument('-b', '--band', dest='band', default=p_def.band,
         help='band, one of \'r\' (default)|\'u\'')
-    parser.add_option('-t', '--type', dest='image_type', type='string', default=p_def.image_type,
+    parser.add_argument('-t', '--type', dest='image_type', default=p_def.image_type,
         help='image type, one of \'tile\' (default)|\'weight\'|\'weight.fz\'|\'exposure\'|\'exposure_weight\''
              '|\'exposure_weight.fz\'|\'exposure_flag\'|\'exposure_flag.fz\'|\'cat\'')
 
-    parser.add_option('', '--coord', dest='coord', type='string', default=None,
+    parser.add_argument('--coord', dest='coord', default=None,
         help='(white-space or \'_\' separated) string of input coordinates, as astropy.coordinates.Angle')
-    parser.add_option('', '--number', dest='number', type='string', default=None,
+    parser.add_argument('--number', dest='number', default=None,
         help='input image number')
-    parser.add_option('', '--area', dest='area', type='string', default=None,
+    parser.add_argument('--area', dest='area', default=None,
         help='area corner coordinates ra0_dec0_ra1_dec1')
-    parser.add_option('', '--tile', dest='tile', action='store_true',
+    parser.add_argument('--tile', dest='tile', action='store_true',
         help='return exposures used in input tile(s)')
 
     # Monitoring
-    parser.add_option('-v', '--verbose', dest='verbose', action='store_true', help='verbose output')
+    parser.add_argument('-v', '--verbose', dest='verbose', action='store_true', help='verbose output')
 
-    options, args = parser.parse_args()
+    options = parser.parse_args()
 
-    return options, args
+    return options
 
 
 def check_options(options):
@@ -247,7 +236,7 @@ def check_options(options):
     """
 
     if int(options.number != None) + int(options.coord != None) \
-        + int(options.area != None) + int(options.tile != None) > 1:
+        + int(options.area != None) + int(options.tile) > 1:
         raise cfis.CfisError('Only one option out of \'--number\', \'--coord\', \'--area\', \'--tile\' can be given')
 
     if options.image_type != 'exposure' and options.no_cuts == True:
@@ -280,17 +269,9 @@ def update_param(p_def, options):
         updated paramter values
     """
 
-    param = copy.copy(p_def)
-
-    # Update keys in param according to options values
-    for key in vars(param):
-        if key in vars(options):
-            setattr(param, key, getattr(options, key))
-
-    # Add remaining keys from options to param
-    for key in vars(options):
-        if not key in vars(param):
-            setattr(param, key, getattr(options, key))
+    # Update default values with options, and add remaining keys
+    # from options to param
+    param = type(p_def)(**{**vars(p_def), **vars(options)})
 
     # Do extra stuff if necessary
     if param.outbase is not None:
@@ -329,8 +310,7 @@ def run_mode(images, param):
         if len(images_found) > 0:
             if not param.short:
                 images_found[0].print_header(file=param.fout)
-            for img in images_found:
-                img.print(file=param.fout, base_name=param.out_base_name, name_only=param.out_name_only, ID_only=param.out_ID_only)
+            cfis.ImageTable.from_images(images_found).print(file=param.fout, base_name=param.out_base_name, name_only=param.out_name_only, ID_only=param.out_ID_only)
             ex = 0
 
     elif param.number:
@@ -354,8 +334,7 @@ def run_mode(images, param):
         if len(images_found) > 0:
             if not param.short:
                 images_found[0].print_header(file=param.fout)
-            for img in images_found:
-                img.print(file=param.fout, base_name=param.out_base_name, name_only=param.out_name_only, ID_only=param.out_ID_only)
+            cfis.ImageTable.from_images(images_found).print(file=param.fout, base_name=param.out_base_name, name_only=param.out_name_only, ID_only=param.out_ID_only)
             if param.plot == True:
                 if param.verbose == True:
                     print('Creating plots')
@@ -391,8 +370,7 @@ def main(argv=None):
     p_def = params_default()
 
     # Command line options
-    options, args = parse_options(p_def)
-    # Without option parsing, this would be: args = argv[1:]
+    options = parse_options(p_def)
 
     if check_options(options) is False:
         return 1
@@ -13,7 +13,6 @@ import re
 import os
 import sys
 import glob
-import copy
 import io
 from contextlib import redirect_stdout
 from optparse import OptionParser
@@ -150,17 +149,9 @@ def update_param(p_def, options):
         updated paramter values
     """
 
-    param = copy.copy(p_def)
-
-    # Update keys in param according to options values
-    for key in vars(param):
-        if key in vars(options):
-            setattr(param, key, getattr(options, key))
-
-    # Add remaining keys from options to param
-    for key in vars(options):
-        if not key in vars(param):
-            setattr(param, key, getattr(options, key))
+    # Update default values with options, and add remaining keys
+    # from options to param
+    param = type(p_def)(**{**vars(p_def), **vars(options)})
 
     # Do extra stuff if necessary
 
@@ -217,27 +208,31 @@ def create_links(input_dir, output_dir, input_IDs, result_base_names, verbose=Fa
     if verbose:
         print('Creating links...')
 
+    input_dir_abs = os.path.abspath(input_dir)
+
     n_total = {}
     n_created = 0
     n_existed = 0
     for ID in input_IDs:
         n_total[ID] = 0
         for base in result_base_names:
-            name = '{}_{}.tgz'.format(base, ID)
-            src = '{}/{}'.format(os.path.abspath(input_dir), name)
-            link_name = '{}/{}'.format(output_dir, name)
+            name = f'{base}_{ID}.tgz'
+            src = os.path.join(input_dir_abs, name)
+            link_name = os.path.join(output_dir, name)
 
             #if verbose:
                 #print('Creating link {} <- {}'.format(src, link_name))
 
             if not os.path.exists(src):
                 #raise IOError('Source file \'{}\' does not exist'.format(src))
-                print('Source file \'{}\' does not exist, skipping'.format(src))
-            elif not os.path.exists(link_name):
-                os.symlink(src, link_name)
-                n_created = n_created + 1
+                print(f'Source file \'{src}\' does not exist, skipping')
             else:
-                n_existed = n_existed + 1
+                # Create link directly, an existing link raises an error
+                try:
+                    os.symlink(src, link_name)
+                    n_created = n_created + 1
+                except FileExistsError:
+                    n_existed = n_existed + 1
 
             n_total[ID] = n_total[ID] + 1
 
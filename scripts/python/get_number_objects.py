@@ -11,7 +11,6 @@ Get number of objects in a (last-run SExtractor) catalogue.
 """
 
 import sys
-import copy
 import glob
 
 from optparse import OptionParser                                               
@@ -160,17 +159,9 @@ def update_param(p_def, options):
         updated paramter values
 
     """
-    param = copy.copy(p_def)
-
-    # Update keys in param according to options values
-    for key in vars(param):
-        if key in vars(options):
-            setattr(param, key, getattr(options, key))
-
-    # Add remaining keys from options to param
-    for key in vars(options):
-        if not key in vars(param):
-            setattr(param, key, getattr(options, key))
+    # Update default values with options, and add remaining keys
+    # from options to param
+    param = type(p_def)(**{**vars(p_def), **vars(options)})
 
     # Do extra stuff if necessary
 
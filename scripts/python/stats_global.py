@@ -14,7 +14,6 @@ Output global stats from a ShapePipe run.
 import re
 import os
 import sys
-import copy
 import io
 import glob
 
@@ -24,6 +23,7 @@ import matplotlib.pylab as plt
 from optparse import OptionParser
 
 import shapepipe.utilities.cfis as cfis
+from shapepipe.pipeline.config import CustomParser
 
 
 def params_default():
@@ -120,17 +120,9 @@ def update_param(p_def, options):
         updated paramter values
     """
 
-    param = copy.copy(p_def)
-
-    # Update keys in param according to options values
-    for key in vars(param):
-        if key in vars(options):
-            setattr(param, key, getattr(options, key))
-
-    # Add remaining keys from options to param
-    for key in vars(options):
-        if not key in vars(param):
-            setattr(param, key, getattr(options, key))
+    # Update default values with options, and add remaining keys
+    # from options to param
+    param = type(p_def)(**{**vars(p_def), **vars(options)})
 
     # Do extra stuff if necessary
 
@@ -152,8 +144,15 @@ def get_stats_file_list(param):
     """
 
     # Full paths
-    paths = glob.glob('{}/output/*/setools_runner/output/stat/{}*'.
-                      format(param.input_dir, param.pattern))
+    paths = glob.glob(os.path.join(
+        param.input_dir,
+        'output',
+        '*',
+        'setools_runner',
+        'output',
+        'stat',
+        f'{param.pattern}*',
+    ))
 
     # File names w/o directories
     names = []
@@ -361,8 +360,9 @@ def plot_histograms(hists, config=None, output_dir='.', verbose=False):
             if verbose:
                 print('Creating files \'{}.*\''.format(file_base))
 
-            plt.savefig('{}/{}.png'.format(output_dir, file_base), bbox_inches='tight')
-            np.savetxt('{}/{}.txt'.format(output_dir, file_base), np.transpose([bins, freq]),
+            out_base = os.path.join(output_dir, file_base)
+            plt.savefig(f'{out_base}.png', bbox_inches='tight')
+            np.savetxt(f'{out_base}.txt', np.transpose([bins, freq]),
                        fmt='%10g', header='[{}] [{}]'.format(xlabel, ylabel)),
 
         i = i + 1
@@ -388,8 +388,6 @@ def get_config(config_path, verbose=False):
     if config_path is None:
         return None
 
-    from shapepipe.pipeline.config import CustomParser
-
     if verbose:
         print('Reading configuration file \'{}\''.format(config_path))
 
@@ -60,10 +60,10 @@ def main(argv=None):
     pattern = 'UNIONS_'
     prefix_out = 'img_'
 
-    files = glob.glob('{}/{}*.fits'.format(path, pattern))
+    files = glob.glob(os.path.join(path, f'{pattern}*.fits'))
 
     for input_path in files:
-        output_path = '{}{}'.format(prefix_out, os.path.basename(input_path))
+        output_path = f'{prefix_out}{os.path.basename(input_path)}'
 
         hdu = fits.open(input_path)
 
@@ -9,11 +9,16 @@ This module copies all images required for processing.
 import glob
 import os
 import re
+import string
 import sys
 
 from shapepipe.modules.module_decorator import module_runner
 from cs_util.canfar import vosHandler
 
+# Replace dots ('.') with dashes ('-') to avoid confusion with file
+# extension delimiters, and remove letters and underscores
+_IN2OUT_TABLE = str.maketrans('.', '-', string.ascii_letters + '_')
+
 
 # pragma: no cover
 def read_image_numbers(path):
@@ -56,14 +61,11 @@ def in2out_pattern(number):
         Output number
 
     """
-    # replace dots ('.') with dashes ('-') to avoid confusion
-    # with file extension delimiters
-    number_final = re.sub(r'\.', '-', number)
-
-    # remove letters in number
-    number_final = re.sub('[a-zA-Z]', '', number_final)
-    # make robust for more generalized file names
-    number_final = re.sub(r'_', '', number_final)
+    if not isinstance(number, str):
+        raise TypeError(f'Input number must be a string, not {type(number)}')
+
+    # Single pass over the string instead of one regex pass per rule
+    number_final = number.translate(_IN2OUT_TABLE)
     return number_final
 
 
@@ -376,8 +378,9 @@ class GetImages(object):
                 )
 
             dst = out_path_renamed
+            dst_is_dir = os.path.isdir(dst)
             for src in all_src:
-                if os.path.isdir(dst):
+                if dst_is_dir:
                     # OUTPUT_FILE_PATTERN is '*', so dst is not regular file
                     # but directory. Append input file name
                     dst_name = f'{dst}/{os.path.basename(src)}'
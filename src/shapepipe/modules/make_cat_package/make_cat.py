@@ -153,8 +153,8 @@ def save_sm_data(
     if do_classif:
         obj_flag = np.ones_like(sm, dtype='int16') * 2
         classif = sm + 2.0 * sm_err
-        obj_flag[np.where(np.abs(classif) < star_thresh)] = 0
-        obj_flag[np.where(classif > gal_thresh)] = 1
+        obj_flag[np.abs(classif) < star_thresh] = 0
+        obj_flag[classif > gal_thresh] = 1
 
         final_cat_file.add_col('SPREAD_CLASS', obj_flag)
 
@@ -261,7 +261,7 @@ class MCCDinterpolator(object):
             raise ImportError('Galsim is required to get shapes information')
 
         masks = np.zeros_like(star_vign)
-        masks[np.where(star_vign == -1e30)] = 1
+        masks[star_vign == -1e30] = 1
 
         star_moms = [hsm.FindAdaptiveMom(
             Image(star),
@@ -410,12 +410,22 @@ class MCCDinterpolator(object):
         final_list = []
         for hdu_index in hdu_ind:
             exp_name = cat.get_data(hdu_index)['EXP_NAME'][0]
-            ccd_list = list(set(cat.get_data(hdu_index)['CCD_N']))
+            ccd_col = cat.get_data(hdu_index)['CCD_N']
+            # Group the objects by CCD with a single sort
+            ccd_order = np.argsort(ccd_col, kind='stable')
+            ccd_list, ccd_start = np.unique(
+                ccd_col[ccd_order],
+                return_index=True,
+            )
+            ccd_end = np.append(ccd_start[1:], len(ccd_col))
+            # Gather the ids and positions once, each CCD is then a slice
+            sorted_id = all_id[ccd_order]
+            sorted_pos = self.gal_pos[ccd_order]
             array_psf = None
             array_id = None
             array_shape = None
             array_exp_name = None
-            for ccd in ccd_list:
+            for ccd, start, end in zip(ccd_list, ccd_start, ccd_end):
                 if ccd == -1:
                     continue
                 # dot_psf_path = self._dot_psf_dir + '/' +\
@@ -424,12 +434,11 @@ class MCCDinterpolator(object):
                 mccd_model_path = self._dot_psf_dir + '/' +\
                     self._dot_psf_pattern + '-' + exp_name + '.npy'
 
-                ind_obj = np.where(cat.get_data(hdu_index)['CCD_N'] == ccd)[0]
-                obj_id = all_id[ind_obj]
+                obj_id = sorted_id[start:end]
                 gal_pos = np.array(
                     self._f_wcs_file[exp_name][ccd]['WCS'].all_world2pix(
-                        self.gal_pos[:, 0][ind_obj],
-                        self.gal_pos[:, 1][ind_obj],
+                        sorted_pos[start:end, 0],
+                        sorted_pos[start:end, 1],
                         0
                     )
                 ).T
@@ -10,7 +10,6 @@ import os
 import re
 import warnings
 
-import numpy as np
 from astropy.io import fits
 
 from shapepipe.pipeline import file_io
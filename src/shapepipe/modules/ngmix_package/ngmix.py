@@ -20,6 +20,20 @@ from sqlitedict import SqliteDict
 
 from shapepipe.pipeline import file_io
 
+# Metacalibration types, in output order
+_MCAL_TYPES = ('1m', '1p', '2m', '2p', 'noshear')
+
+# Metacalibration specific parameters
+_METACAL_PARS = {
+    'types': ['noshear', '1p', '1m', '2p', '2m'],
+    'step': 0.01,
+    'psf': 'gauss',
+    'fixnoise': True,
+    'cheatnoise': False,
+    'symmetrize_psf': False,
+    'use_noise_image': True
+}
+
 
 class Ngmix(object):
     """Ngmix.
@@ -193,113 +207,69 @@ class Ngmix(object):
             If SNR key not found
 
         """
-        names = ['1m', '1p', '2m', '2p', 'noshear']
-        names2 = [
-            'id',
-            'n_epoch_model',
-            'moments_fail',
-            'ntry_fit',
-            'g1_psfo_ngmix',
-            'g2_psfo_ngmix',
-            'T_psfo_ngmix',
-            'g1_err_psfo_ngmix',
-            'g2_err_psfo_ngmix',
-            'T_err_psfo_ngmix',
-            'g1',
-            'g1_err',
-            'g2',
-            'g2_err',
-            'T',
-            'T_err',
-            'Tpsf',
-            'g1_psf',
-            'g2_psf',
-            'flux',
-            'flux_err',
-            's2n',
-            'mag',
-            'mag_err',
-            'flags',
-            'mcal_flags'
-        ]
-        output_dict = {k: {kk: [] for kk in names2} for k in names}
-        for idx in range(len(results)):
-            for name in names:
-
-                mag = (
-                    -2.5 * np.log10(results[idx][name]['flux'])
-                    + self._zero_point
-                )
-                mag_err = np.abs(
-                    -2.5 * results[idx][name]['flux_err']
-                    / (results[idx][name]['flux'] * np.log(10))
-                )
-
-                output_dict[name]['id'].append(results[idx]['obj_id'])
-                output_dict[name]['n_epoch_model'].append(
-                    results[idx]['n_epoch_model']
-                )
-                output_dict[name]['moments_fail'].append(
-                    results[idx]['moments_fail']
-                )
-                output_dict[name]['ntry_fit'].append(
-                    results[idx][name]['ntry']
-                )
-                output_dict[name]['g1_psfo_ngmix'].append(
-                    results[idx]['g_PSFo'][0]
-                )
-                output_dict[name]['g2_psfo_ngmix'].append(
-                    results[idx]['g_PSFo'][1]
-                )
-                output_dict[name]['g1_err_psfo_ngmix'].append(
-                    results[idx]['g_err_PSFo'][0]
-                )
-                output_dict[name]['g2_err_psfo_ngmix'].append(
-                    results[idx]['g_err_PSFo'][1]
-                )
-                output_dict[name]['T_psfo_ngmix'].append(
-                    results[idx]['T_PSFo']
-                )
-                output_dict[name]['T_err_psfo_ngmix'].append(
-                    results[idx]['T_err_PSFo']
-                )
-                output_dict[name]['g1'].append(results[idx][name]['g'][0])
-                output_dict[name]['g1_err'].append(
-                    results[idx][name]['pars_err'][2]
-                )
-                output_dict[name]['g2'].append(results[idx][name]['g'][1])
-                output_dict[name]['g2_err'].append(
-                    results[idx][name]['pars_err'][3]
-                )
-                output_dict[name]['T'].append(results[idx][name]['T'])
-                output_dict[name]['T_err'].append(results[idx][name]['T_err'])
-                output_dict[name]['Tpsf'].append(results[idx][name]['Tpsf'])
-                output_dict[name]['g1_psf'].append(
-                    results[idx][name]['gpsf'][0]
-                )
-                output_dict[name]['g2_psf'].append(
-                    results[idx][name]['gpsf'][1]
-                )
-                output_dict[name]['flux'].append(results[idx][name]['flux'])
-                output_dict[name]['flux_err'].append(
-                    results[idx][name]['flux_err']
-                )
-                output_dict[name]['mag'].append(mag)
-                output_dict[name]['mag_err'].append(mag_err)
-
-                if 's2n' in results[idx][name]:
-                    output_dict[name]['s2n'].append(results[idx][name]['s2n'])
-                elif 's2n_r' in results[idx][name]:
-                    output_dict[name]['s2n'].append(
-                        results[idx][name]['s2n_r']
-                    )
+        names = _MCAL_TYPES
+
+        # Quantities common to all metacal types
+        common_dict = {
+            'id': [res['obj_id'] for res in results],
+            'n_epoch_model': [res['n_epoch_model'] for res in results],
+            'moments_fail': [res['moments_fail'] for res in results],
+            'g1_psfo_ngmix': [res['g_PSFo'][0] for res in results],
+            'g2_psfo_ngmix': [res['g_PSFo'][1] for res in results],
+            'T_psfo_ngmix': [res['T_PSFo'] for res in results],
+            'g1_err_psfo_ngmix': [res['g_err_PSFo'][0] for res in results],
+            'g2_err_psfo_ngmix': [res['g_err_PSFo'][1] for res in results],
+            'T_err_psfo_ngmix': [res['T_err_PSFo'] for res in results],
+            'mcal_flags': [res['mcal_flags'] for res in results],
+        }
+
+        output_dict = {}
+        for name in names:
+            res_name = [res[name] for res in results]
+
+            s2n = []
+            for res in res_name:
+                if 's2n' in res:
+                    s2n.append(res['s2n'])
+                elif 's2n_r' in res:
+                    s2n.append(res['s2n_r'])
                 else:
                     raise KeyError('No SNR key (s2n, s2n_r) found in results')
 
-                output_dict[name]['flags'].append(results[idx][name]['flags'])
-                output_dict[name]['mcal_flags'].append(
-                    results[idx]['mcal_flags']
-                )
+            # Magnitudes are computed for all objects at once
+            flux = np.array([res['flux'] for res in res_name])
+            flux_err = np.array([res['flux_err'] for res in res_name])
+            mag = -2.5 * np.log10(flux) + self._zero_point
+            mag_err = np.abs(-2.5 * flux_err / (flux * np.log(10)))
+
+            output_dict[name] = {
+                'id': common_dict['id'],
+                'n_epoch_model': common_dict['n_epoch_model'],
+                'moments_fail': common_dict['moments_fail'],
+                'ntry_fit': [res['ntry'] for res in res_name],
+                'g1_psfo_ngmix': common_dict['g1_psfo_ngmix'],
+                'g2_psfo_ngmix': common_dict['g2_psfo_ngmix'],
+                'T_psfo_ngmix': common_dict['T_psfo_ngmix'],
+                'g1_err_psfo_ngmix': common_dict['g1_err_psfo_ngmix'],
+                'g2_err_psfo_ngmix': common_dict['g2_err_psfo_ngmix'],
+                'T_err_psfo_ngmix': common_dict['T_err_psfo_ngmix'],
+                'g1': [res['g'][0] for res in res_name],
+                'g1_err': [res['pars_err'][2] for res in res_name],
+                'g2': [res['g'][1] for res in res_name],
+                'g2_err': [res['pars_err'][3] for res in res_name],
+                'T': [res['T'] for res in res_name],
+                'T_err': [res['T_err'] for res in res_name],
+                'Tpsf': [res['Tpsf'] for res in res_name],
+                'g1_psf': [res['gpsf'][0] for res in res_name],
+                'g2_psf': [res['gpsf'][1] for res in res_name],
+                'flux': flux,
+                'flux_err': flux_err,
+                's2n': s2n,
+                'mag': mag,
+                'mag_err': mag_err,
+                'flags': [res['flags'] for res in res_name],
+                'mcal_flags': common_dict['mcal_flags'],
+            }
 
         return output_dict
 
@@ -337,27 +307,36 @@ class Ngmix(object):
             Dictionary containing the NGMIX metacal results
 
         """
+        # Memory map the tile catalogue, only a few columns and the vignet
+        # mask are kept
         tile_cat = file_io.FITSCatalogue(
             self._tile_cat_path,
+            memmap=True,
             SEx_catalogue=True,
         )
         tile_cat.open()
-        obj_id = np.copy(tile_cat.get_data()['NUMBER'])
-        tile_vign = np.copy(tile_cat.get_data()['VIGNET'])
-        tile_ra = np.copy(tile_cat.get_data()['XWIN_WORLD'])
-        tile_dec = np.copy(tile_cat.get_data()['YWIN_WORLD'])
+        tile_data = tile_cat.get_data()
+        obj_id = np.copy(tile_data['NUMBER'])
+        # Only the pixels without data in the tile vignets are used
+        tile_vign_mask = tile_data['VIGNET'] == -1e30
+        tile_ra = np.copy(tile_data['XWIN_WORLD'])
+        tile_dec = np.copy(tile_data['YWIN_WORLD'])
         tile_cat.close()
 
-        f_wcs_file = SqliteDict(self._f_wcs_path)
-        gal_vign_cat = SqliteDict(self._gal_vignet_path)
-        bkg_vign_cat = SqliteDict(self._bkg_vignet_path)
-        psf_vign_cat = SqliteDict(self._psf_vignet_path)
-        weight_vign_cat = SqliteDict(self._weight_vignet_path)
-        flag_vign_cat = SqliteDict(self._flag_vignet_path)
+        # Input databases are only read
+        f_wcs_file = SqliteDict(self._f_wcs_path, flag='r')
+        gal_vign_cat = SqliteDict(self._gal_vignet_path, flag='r')
+        bkg_vign_cat = SqliteDict(self._bkg_vignet_path, flag='r')
+        psf_vign_cat = SqliteDict(self._psf_vignet_path, flag='r')
+        weight_vign_cat = SqliteDict(self._weight_vignet_path, flag='r')
+        flag_vign_cat = SqliteDict(self._flag_vignet_path, flag='r')
 
         final_res = []
         prior = self.get_prior()
 
+        # GalSim WCS and flux scale per exposure-CCD, shared by all objects
+        ccd_wcs_cache = {}
+
         count = 0
         id_first = -1
         id_last = -1
@@ -381,64 +360,66 @@ class Ngmix(object):
             weight_vign = []
             flag_vign = []
             jacob_list = []
-            if (
-                (psf_vign_cat[str(id_tmp)] == 'empty')
-                or (gal_vign_cat[str(id_tmp)] == 'empty')
-            ):
+
+            # Each database lookup unpickles all epochs of the object,
+            # read them once per object
+            id_str = str(id_tmp)
+            psf_vign_obj = psf_vign_cat[id_str]
+            if psf_vign_obj == 'empty':
+                continue
+            gal_vign_obj = gal_vign_cat[id_str]
+            if gal_vign_obj == 'empty':
                 continue
-            psf_expccd_name = list(psf_vign_cat[str(id_tmp)].keys())
-            for expccd_name_tmp in psf_expccd_name:
-                exp_name, ccd_n = re.split('-', expccd_name_tmp)
+            bkg_vign_obj = bkg_vign_cat[id_str]
+            flag_vign_obj = flag_vign_cat[id_str]
+            weight_vign_obj = weight_vign_cat[id_str]
 
-                gal_vign_tmp = (
-                    gal_vign_cat[str(id_tmp)][expccd_name_tmp]['VIGNET']
-                )
-                if len(np.where(gal_vign_tmp.ravel() == 0)[0]) != 0:
-                    continue
+            for expccd_name_tmp in psf_vign_obj:
+                exp_name, ccd_n = expccd_name_tmp.split('-')
+                ccd_n = int(ccd_n)
 
-                bkg_vign_tmp = (
-                    bkg_vign_cat[str(id_tmp)][expccd_name_tmp]['VIGNET']
-                )
-                gal_vign_sub_bkg = gal_vign_tmp - bkg_vign_tmp
+                gal_vign_tmp = gal_vign_obj[expccd_name_tmp]['VIGNET']
+                if np.any(gal_vign_tmp == 0):
+                    continue
 
-                tile_vign_tmp = (
-                    Ngmix.MegaCamFlip(np.copy(tile_vign[i_tile]), int(ccd_n))
+                tile_vign_mask_tmp = (
+                    Ngmix.MegaCamFlip(tile_vign_mask[i_tile], ccd_n)
                 )
 
-                flag_vign_tmp = (
-                    flag_vign_cat[str(id_tmp)][expccd_name_tmp]['VIGNET']
-                )
-                flag_vign_tmp[np.where(tile_vign_tmp == -1e30)] = 2**10
-                v_flag_tmp = flag_vign_tmp.ravel()
-                if len(np.where(v_flag_tmp != 0)[0]) / (51 * 51) > 1 / 3.0:
+                # Reject epochs with too many flagged pixels before doing
+                # any further work on them
+                flag_vign_tmp = flag_vign_obj[expccd_name_tmp]['VIGNET']
+                flag_vign_tmp[tile_vign_mask_tmp] = 2**10
+                if np.count_nonzero(flag_vign_tmp) / (51 * 51) > 1 / 3.0:
                     continue
 
-                weight_vign_tmp = (
-                    weight_vign_cat[str(id_tmp)][expccd_name_tmp]['VIGNET']
-                )
+                bkg_vign_tmp = bkg_vign_obj[expccd_name_tmp]['VIGNET']
+                gal_vign_sub_bkg = gal_vign_tmp - bkg_vign_tmp
+
+                weight_vign_tmp = weight_vign_obj[expccd_name_tmp]['VIGNET']
+
+                if expccd_name_tmp not in ccd_wcs_cache:
+                    ccd_wcs = f_wcs_file[exp_name][ccd_n]
+                    header_tmp = fits.Header.fromstring(ccd_wcs['header'])
+                    ccd_wcs_cache[expccd_name_tmp] = (
+                        galsim.fitswcs.AstropyWCS(wcs=ccd_wcs['WCS']),
+                        header_tmp['FSCALE'],
+                    )
+                g_wcs, Fscale = ccd_wcs_cache[expccd_name_tmp]
 
                 jacob_tmp = get_jacob(
-                    f_wcs_file[exp_name][int(ccd_n)]['WCS'],
+                    g_wcs,
                     tile_ra[i_tile],
                     tile_dec[i_tile]
                 )
 
-                header_tmp = fits.Header.fromstring(
-                    f_wcs_file[exp_name][int(ccd_n)]['header']
-                )
-                Fscale = header_tmp['FSCALE']
-
                 gal_vign_scaled = gal_vign_sub_bkg * Fscale
                 weight_vign_scaled = weight_vign_tmp * 1 / Fscale ** 2
 
                 gal_vign.append(gal_vign_scaled)
-                psf_vign.append(
-                    psf_vign_cat[str(id_tmp)][expccd_name_tmp]['VIGNET']
-                )
+                psf_vign.append(psf_vign_obj[expccd_name_tmp]['VIGNET'])
                 sigma_psf.append(
-                    psf_vign_cat[
-                        str(id_tmp)
-                    ][expccd_name_tmp]['SHAPES']['SIGMA_PSF_HSM']
+                    psf_vign_obj[expccd_name_tmp]['SHAPES']['SIGMA_PSF_HSM']
                 )
                 weight_vign.append(weight_vign_scaled)
                 flag_vign.append(flag_vign_tmp)
@@ -670,8 +651,9 @@ def get_jacob(wcs, ra, dec):
 
     Parameters
     ----------
-    wcs : astropy.wcs.WCS
-        WCS object for which we want the Jacobian
+    wcs : astropy.wcs.WCS or galsim.fitswcs.AstropyWCS
+        WCS object for which we want the Jacobian; pass the GalSim wrapper
+        to reuse it for several positions
     ra : float
         RA position of the center of the vignet (in degrees)
     dec : float
@@ -683,7 +665,10 @@ def get_jacob(wcs, ra, dec):
         Jacobian of the WCS at the required position
 
     """
-    g_wcs = galsim.fitswcs.AstropyWCS(wcs=wcs)
+    if isinstance(wcs, galsim.fitswcs.AstropyWCS):
+        g_wcs = wcs
+    else:
+        g_wcs = galsim.fitswcs.AstropyWCS(wcs=wcs)
     world_pos = galsim.CelestialCoord(
         ra=ra * galsim.angle.degrees,
         dec=dec * galsim.angle.degrees,
@@ -735,9 +720,11 @@ def get_noise(gal, weight, guess, pixel_scale, thresh=1.2):
         scale=pixel_scale
     ).array
 
-    m_weight = weight[gauss_win < thresh * sig_tmp] != 0
+    # Pixels outside of the window function
+    m_win = gauss_win < thresh * sig_tmp
+    m_weight = weight[m_win] != 0
 
-    sig_noise = sigma_mad(gal[gauss_win < thresh * sig_tmp][m_weight])
+    sig_noise = sigma_mad(gal[m_win][m_weight])
 
     return sig_noise
 
@@ -799,11 +786,18 @@ def do_ngmix_metacal(
     gal_guess = []
     gal_guess_flag = True
     wsum = 0
+
+    # Vignet centres are the same for all epochs
+    psf_cen_row = (psfs[0].shape[0] - 1) / 2
+    psf_cen_col = (psfs[0].shape[1] - 1) / 2
+    gal_cen_row = (gals[0].shape[0] - 1) / 2
+    gal_cen_col = (gals[0].shape[1] - 1) / 2
+
     for n_e in range(n_epoch):
 
         psf_jacob = ngmix.Jacobian(
-            row=(psfs[0].shape[0] - 1) / 2,
-            col=(psfs[0].shape[1] - 1) / 2,
+            row=psf_cen_row,
+            col=psf_cen_col,
             wcs=jacob_list[n_e]
         )
 
@@ -811,9 +805,10 @@ def do_ngmix_metacal(
 
         psf_T = psfs_sigma[n_e] * 1.17741 * pixel_scale
 
-        weight_map = np.copy(weights[n_e])
-        weight_map[np.where(flags[n_e] != 0)] = 0.
-        weight_map[weight_map != 0] = 1
+        # Binary weight: 1 for unflagged pixels with non-zero weight
+        weight_map = (
+            (weights[n_e] != 0) & (flags[n_e] == 0)
+        ).astype(weights[n_e].dtype)
 
         psf_guess = np.array([0., 0., 0., 0., psf_T, 1.])
         try:
@@ -834,8 +829,8 @@ def do_ngmix_metacal(
 
         # Recenter jacobian if necessary
         gal_jacob = ngmix.Jacobian(
-            row=(gals[0].shape[0] - 1) / 2 + gal_guess_tmp[0],
-            col=(gals[0].shape[1] - 1) / 2 + gal_guess_tmp[1],
+            row=gal_cen_row + gal_guess_tmp[0],
+            col=gal_cen_col + gal_guess_tmp[1],
             wcs=jacob_list[n_e]
         )
 
@@ -854,8 +849,9 @@ def do_ngmix_metacal(
         noise_img_gal = np.random.randn(*gals[n_e].shape) * sig_noise
 
         gal_masked = np.copy(gals[n_e])
-        if (len(np.where(weight_map == 0)[0]) != 0):
-            gal_masked[weight_map == 0] = noise_img_gal[weight_map == 0]
+        m_masked = weight_map == 0
+        if np.any(m_masked):
+            gal_masked[m_masked] = noise_img_gal[m_masked]
 
         weight_map *= 1 / sig_noise ** 2
 
@@ -904,28 +900,20 @@ def do_ngmix_metacal(
     psf_model = 'gauss'
     gal_model = 'gauss'
 
-    # metacal specific parameters
-    metacal_pars = {
-        'types': ['noshear', '1p', '1m', '2p', '2m'],
-        'step': 0.01,
-        'psf': 'gauss',
-        'fixnoise': True,
-        'cheatnoise': False,
-        'symmetrize_psf': False,
-        'use_noise_image': True
-    }
-
     Tguess = np.mean(T_guess_psf)
 
     # retry the fit twice
     ntry = 2
 
-    obs_dict_mcal = ngmix.metacal.get_all_metacal(gal_obs_list, **metacal_pars)
+    obs_dict_mcal = ngmix.metacal.get_all_metacal(
+        gal_obs_list,
+        **_METACAL_PARS
+    )
     res = {'mcal_flags': 0}
 
     ntry = 5
 
-    for key in sorted(obs_dict_mcal):
+    for key in _MCAL_TYPES:
 
         fres = make_galsimfit(
             obs_dict_mcal[key],
@@ -985,7 +973,7 @@ def do_ngmix_metacal(
 
         res[key] = tres
 
-    # result dictionary, keyed by the types in metacal_pars above
+    # result dictionary, keyed by the types in _METACAL_PARS
     metacal_res = res
 
     metacal_res.update(psf_res_gT)
@@ -32,6 +32,8 @@ STAR_THRESH : int
     Threshold of stars under which the PSF is not interpolated
 CHI2_THRESH : int
     Threshold for chi squared (:math:`\chi^2`)
+N_JOBS : int, optional
+    Number of parallel jobs used to compute the PSF shapes, default is ``1``
 ME_DOT_PSF_DIR : str
     Module name of last run producing PSFEx PSF model files, for multi-epoch
     processing. The specifier "last:" is not required
@@ -7,10 +7,11 @@ This module computes the PSFs from a PSFEx model at several galaxy positions.
 """
 
 import os
-import re
+from functools import lru_cache
 
 import numpy as np
 from astropy.io import fits
+from joblib import Parallel, delayed
 from sqlitedict import SqliteDict
 
 from shapepipe.pipeline import file_io
@@ -29,6 +30,107 @@ BAD_CHI2 = 'Fail_chi2'
 FILE_NOT_FOUND = 'File_not_found'
 
 
+def read_psfex_model(dotpsfpath):
+    """Read PSFEx Model.
+
+    Read the header and the PSF basis of a PSFEx model. Results are cached,
+    so that a model shared by several catalogues is only read once.
+
+    Parameters
+    ----------
+    dotpsfpath : str
+        Path to ``.psf`` file (PSFEx output)
+
+    Returns
+    -------
+    tuple
+        Header of the PSF model HDU and PSF basis in single precision
+
+    """
+    # The cached model is only reused while the file is unchanged
+    stat = os.stat(dotpsfpath)
+
+    return _read_psfex_model(dotpsfpath, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _read_psfex_model(dotpsfpath, mtime_ns, size):
+    """Read PSFEx Model.
+
+    Read the header and the PSF basis of a PSFEx model. Results are cached
+    for a given file modification time and size.
+
+    Parameters
+    ----------
+    dotpsfpath : str
+        Path to ``.psf`` file (PSFEx output)
+    mtime_ns : int
+        File modification time in nanoseconds
+    size : int
+        File size in bytes
+
+    Returns
+    -------
+    tuple
+        Header of the PSF model HDU and PSF basis in single precision
+
+    """
+    # the basis is read from a memory map and only converted to native
+    # single precision once
+    with fits.open(dotpsfpath, memmap=True) as hdu_list:
+        header = hdu_list[1].header.copy()
+        PSF_basis = hdu_list[1].data.field(0)[0].astype(np.float32)
+
+    # the cached basis is shared between calls
+    PSF_basis.flags.writeable = False
+
+    return header, PSF_basis
+
+
+def get_poly_coeffs(pos, deg, zero, scale):
+    """Get Polynomial Coefficients.
+
+    Compute the PSFEx polynomial terms at the given positions. They only
+    depend on the positions and on the polynomial set-up, and can therefore
+    be reused for several PSF models sharing the same positions.
+
+    Parameters
+    ----------
+    pos : numpy.ndarray
+        Positions where the PSF model should be evaluated
+    deg : int
+        Polynomial degree
+    zero : tuple
+        Zero points of the x and y positions
+    scale : tuple
+        Scales of the x and y positions
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of polynomial terms, each row corresponds to one position
+
+    """
+    # scale coordinates
+    xs = (pos[:, 0] - zero[0]) / scale[0]
+    ys = (pos[:, 1] - zero[1]) / scale[1]
+
+    # polynomial exponents, ordered as in PSFEx: x^j for j in [0, deg], then
+    # x^j * y^i for i in [1, deg] and j in [0, deg - i]
+    x_pow, y_pow = np.array([
+        (idx_j, idx_i)
+        for idx_i in range(deg + 1)
+        for idx_j in range(deg - idx_i + 1)
+    ]).T
+
+    # compute polynomial coefficients for all positions at once, from the
+    # successive powers of each coordinate
+    x_vander = np.vander(xs, deg + 1, increasing=True)
+    y_vander = np.vander(ys, deg + 1, increasing=True)
+
+    return x_vander[:, x_pow] * y_vander[:, y_pow]
+
+
 def interpsfex(dotpsfpath, pos, thresh_star, thresh_chi2):
     """Interpolate PSFEx.
 
@@ -56,56 +158,71 @@ def interpsfex(dotpsfpath, pos, thresh_star, thresh_chi2):
         return FILE_NOT_FOUND
 
     # read PSF model and extract basis and polynomial degree and scale position
-    PSF_model = fits.open(dotpsfpath)[1]
+    header, PSF_basis = read_psfex_model(dotpsfpath)
 
     # Check number of stars used to compute the PSF
-    if PSF_model.header['ACCEPTED'] < thresh_star:
+    if header['ACCEPTED'] < thresh_star:
         return NOT_ENOUGH_STARS
-    if PSF_model.header['CHI2'] > thresh_chi2:
+    if header['CHI2'] > thresh_chi2:
         return BAD_CHI2
 
-    PSF_basis = np.array(PSF_model.data)[0][0]
     try:
-        deg = PSF_model.header['POLDEG1']
+        deg = header['POLDEG1']
     except KeyError:
         # constant PSF model
         return PSF_basis[0, :, :]
 
-    # scale coordinates
-    x_interp, x_scale = (
-        PSF_model.header['POLZERO1'],
-        PSF_model.header['POLSCAL1']
+    # compute polynomial coefficients at the scaled positions
+    coeffs = get_poly_coeffs(
+        pos,
+        deg,
+        (header['POLZERO1'], header['POLZERO2']),
+        (header['POLSCAL1'], header['POLSCAL2']),
     )
-    y_interp, y_scale = (
-        PSF_model.header['POLZERO2'],
-        PSF_model.header['POLSCAL2']
 
+    # compute interpolated PSF as a single matrix product, in the single
+    # precision of the PSFEx basis
+    PSFs = np.tensordot(
+        coeffs.astype(np.float32),
+        PSF_basis[:coeffs.shape[1]],
+        axes=1,
     )
-    xs, ys = (pos[:, 0] - x_interp) / x_scale, (pos[:, 1] - y_interp) / y_scale
-
-    # compute polynomial coefficients
-    coeffs = np.array([[x ** idx for idx in range(deg + 1)] for x in xs])
-    cross_coeffs = np.array([
-        np.concatenate([
-            [(x ** idx_j) * (y ** idx_i) for idx_j in range(deg - idx_i + 1)]
-            for idx_i in range(1, deg + 1)
-        ])
-        for x, y in zip(xs, ys)
-    ])
-    coeffs = np.hstack((coeffs, cross_coeffs))
-
-    # compute interpolated PSF
-    PSFs = np.array([
-        np.sum(
-            [coeff * atom for coeff, atom in zip(coeffs_posi, PSF_basis)],
-            axis=0,
-        )
-        for coeffs_posi in coeffs
-    ])
 
     return PSFs
 
 
+def get_psf_shapes(psfs):
+    """Get PSF Shapes.
+
+    Compute the shapes of PSF images using HSM.
+
+    Parameters
+    ----------
+    psfs : numpy.ndarray
+        Array of PSF images
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shapes, each row contains g1, g2, sigma and error flag
+
+    """
+    psf_moms = [
+        hsm.FindAdaptiveMom(Image(psf), strict=False)
+        for psf in psfs
+    ]
+
+    return np.array([
+        [
+            moms.observed_shape.g1,
+            moms.observed_shape.g2,
+            moms.moments_sigma,
+            int(bool(moms.error_message))
+        ]
+        for moms in psf_moms
+    ]).reshape(-1, 4)
+
+
 class PSFExInterpolator(object):
     """The PSFEx Interpolator Class.
 
@@ -134,6 +251,9 @@ class PSFExInterpolator(object):
         Threshold of stars under which the PSF is not interpolated
     thresh_chi2 : int
         Threshold for chi squared
+    n_jobs : int, optional
+        Number of parallel jobs used to compute the PSF shapes, default is
+        ``1``
 
     """
 
@@ -148,6 +268,7 @@ class PSFExInterpolator(object):
         get_shapes=True,
         star_thresh=20,
         chi2_thresh=2,
+        n_jobs=1,
     ):
 
         # Path to PSFEx output file
@@ -164,9 +285,12 @@ class PSFExInterpolator(object):
         else:
             raise ValueError(f'Cound not find file {galcat_path}.')
         # Path to output file to be written
-        self._output_path = output_path + '/galaxy_psf'
+        self._output_path = os.path.join(output_path, 'galaxy_psf')
         # Path to output file to be written for validation
-        self._output_path_validation = output_path + '/validation_psf'
+        self._output_path_validation = os.path.join(
+            output_path,
+            'validation_psf',
+        )
         # if required, compute and save shapes
         self._compute_shape = get_shapes
         # Number of stars under which we don't interpolate the PSF
@@ -174,6 +298,9 @@ class PSFExInterpolator(object):
 
         self._chi2_thresh = chi2_thresh
 
+        # Number of parallel jobs for the PSF shapes
+        self._n_jobs = n_jobs
+
         # Logging
         self._w_log = w_log
 
@@ -193,12 +320,25 @@ class PSFExInterpolator(object):
 
         self._img_number = img_number
 
-    def process(self):
+    def process(self, force=False):
         """Process.
 
         Process the PSF interpolation single-epoch run.
 
+        Parameters
+        ----------
+        force : bool, optional
+            If ``False`` (default), skip the interpolation when the output file
+            already exists and is more recent than the inputs
+
         """
+        if not force and self._output_up_to_date():
+            self._w_log.info(
+                f'Output file {self._output_path}{self._img_number}.fits is '
+                + 'up to date, skipping interpolation.'
+            )
+            return
+
         if self.gal_pos is None:
             self._get_galaxy_positions()
 
@@ -231,6 +371,34 @@ class PSFExInterpolator(object):
 
             self._write_output()
 
+    def _output_up_to_date(self):
+        """Check Output Up To Date.
+
+        Check whether the output file exists and is more recent than both the
+        PSFEx model and the galaxy catalogue. A missing input is never up to
+        date, so that it is reported by the interpolation step.
+
+        Returns
+        -------
+        bool
+            ``True`` if the output does not need to be computed again
+
+        """
+        output_file = f'{self._output_path}{self._img_number}.fits'
+        if not os.path.isfile(output_file):
+            return False
+
+        for input_file in (self._dotpsf_path, self._galcat_path):
+            if input_file is None or not os.path.isfile(input_file):
+                return False
+
+        input_mtime = max(
+            os.path.getmtime(self._dotpsf_path),
+            os.path.getmtime(self._galcat_path),
+        )
+
+        return os.path.getmtime(output_file) > input_mtime
+
     def _get_position_parameters(self):
         """Get Position Parameters.
 
@@ -254,31 +422,36 @@ class PSFExInterpolator(object):
         if self._pos_params is None:
             self._get_position_parameters()
 
-        galcat = file_io.FITSCatalogue(self._galcat_path, SEx_catalogue=True)
-        galcat.open()
-
-        try:
-            self.gal_pos = np.array([
-                [x, y] for x, y in zip(
-                    galcat.get_data()[self._pos_params[0]],
-                    galcat.get_data()[self._pos_params[1]]
+        # Memory-map the catalogue to only read the two position columns,
+        # which are copied so that the catalogue is released on closing.
+        # FITS columns are big-endian, convert them once to native floats.
+        with file_io.FITSCatalogue(
+            self._galcat_path,
+            SEx_catalogue=True,
+            memmap=True,
+        ) as galcat:
+            try:
+                self.gal_pos = np.column_stack([
+                    np.asarray(
+                        galcat.get_named_col_data(pos_param),
+                        dtype=np.float64,
+                    )
+                    for pos_param in self._pos_params
+                ])
+            except KeyError as detail:
+                # extract erroneous position parameter from original exception
+                err_pos_param = detail.args[0][4:-15]
+                pos_param_err = (
+                    f'Required position parameter {err_pos_param}'
+                    + 'was not found in galaxy catalog. Leave '
+                    + 'pos_params (or EXTRA_CODE_OPTION) blank to '
+                    + 'read them from .psf file.'
                 )
-            ])
-            self._w_log.info(
-                f'Read {self.gal_pos.shape[0]} positions from galaxy catalog'
-            )
+                raise KeyError(pos_param_err)
 
-        except KeyError as detail:
-            # extract erroneous position parameter from original exception
-            err_pos_param = detail.args[0][4:-15]
-            pos_param_err = (
-                f'Required position parameter {err_pos_param}'
-                + 'was not found in galaxy catalog. Leave '
-                + 'pos_params (or EXTRA_CODE_OPTION) blank to '
-                + 'read them from .psf file.'
-            )
-            raise KeyError(pos_param_err)
-        galcat.close()
+        self._w_log.info(
+            f'Read {self.gal_pos.shape[0]} positions from galaxy catalog'
+        )
 
     def _interpolate(self):
         """Interpolate.
@@ -303,20 +476,14 @@ class PSFExInterpolator(object):
         if import_fail:
             raise ImportError('Galsim is required to get shapes information')
 
-        psf_moms = [
-            hsm.FindAdaptiveMom(Image(psf), strict=False)
-            for psf in self.interp_PSFs
-        ]
-
-        self.psf_shapes = np.array([
-            [
-                moms.observed_shape.g1,
-                moms.observed_shape.g2,
-                moms.moments_sigma,
-                int(bool(moms.error_message))
-            ]
-            for moms in psf_moms
-        ])
+        if self._n_jobs > 1:
+            shapes = Parallel(n_jobs=self._n_jobs)(
+                delayed(get_psf_shapes)(psfs)
+                for psfs in np.array_split(self.interp_PSFs, self._n_jobs)
+            )
+            self.psf_shapes = np.concatenate(shapes)
+        else:
+            self.psf_shapes = get_psf_shapes(self.interp_PSFs)
 
     def _write_output(self):
         """Write Output.
@@ -325,7 +492,7 @@ class PSFExInterpolator(object):
 
         """
         output = file_io.FITSCatalogue(
-            self._output_path + self._img_number + '.fits',
+            f'{self._output_path}{self._img_number}.fits',
             open_mode=file_io.BaseCatalogue.OpenMode.ReadWrite,
             SEx_catalogue=True,
         )
@@ -420,7 +587,7 @@ class PSFExInterpolator(object):
             raise ImportError('Galsim is required to get shapes information')
 
         masks = np.zeros_like(star_vign)
-        masks[np.where(star_vign == -1e30)] = 1
+        masks[star_vign == -1e30] = 1
 
         star_moms = [
             hsm.FindAdaptiveMom(Image(star), badpix=Image(mask), strict=False)
@@ -486,7 +653,7 @@ class PSFExInterpolator(object):
 
         """
         output = file_io.FITSCatalogue(
-            self._output_path_validation + self._img_number + '.fits',
+            f'{self._output_path_validation}{self._img_number}.fits',
             open_mode=file_io.BaseCatalogue.OpenMode.ReadWrite,
             SEx_catalogue=True,
         )
@@ -503,12 +670,11 @@ class PSFExInterpolator(object):
         }
         data = {**data, **star_dict}
 
-        data['ACCEPTED'] = np.ones_like(data['NUMBER'], dtype='int16')
         star_used = psfex_cat_dict.pop('SOURCE_NUMBER')
-
-        for idx in range(len(data['NUMBER'])):
-            if idx + 1 not in star_used:
-                data['ACCEPTED'][idx] = 0
+        data['ACCEPTED'] = np.isin(
+            np.arange(1, len(data['NUMBER']) + 1),
+            star_used,
+        ).astype('int16')
 
         output.save_as_fits(data, sex_cat_path=self._galcat_path)
 
@@ -585,24 +751,34 @@ class PSFExInterpolator(object):
         final_list = []
         for hdu_index in hdu_ind:
             exp_name = cat.get_data(hdu_index)['EXP_NAME'][0]
-            ccd_list = list(set(cat.get_data(hdu_index)['CCD_N']))
-            array_psf = None
-            array_id = None
-            array_shape = None
-            array_exp_name = None
-            for ccd in ccd_list:
+            ccd_col = cat.get_data(hdu_index)['CCD_N']
+            # Group the objects by CCD with a single sort
+            ccd_order = np.argsort(ccd_col, kind='stable')
+            ccd_list, ccd_start = np.unique(
+                ccd_col[ccd_order],
+                return_index=True,
+            )
+            ccd_end = np.append(ccd_start[1:], len(ccd_col))
+            # Gather the ids and positions once, each CCD is then a slice
+            sorted_id = all_id[ccd_order]
+            sorted_pos = self.gal_pos[ccd_order]
+            # Results of each CCD, concatenated once all CCDs are done
+            list_psf = []
+            list_id = []
+            list_shape = []
+            list_exp_name = []
+            for ccd, start, end in zip(ccd_list, ccd_start, ccd_end):
                 if ccd == -1:
                     continue
                 dot_psf_path = (
                     f'{self._dot_psf_dir}/{self._dot_psf_pattern}-{exp_name}'
                     + f'-{ccd}.psf'
                 )
-                ind_obj = np.where(cat.get_data(hdu_index)['CCD_N'] == ccd)[0]
-                obj_id = all_id[ind_obj]
+                obj_id = sorted_id[start:end]
                 gal_pos = np.array(
                     self._f_wcs_file[exp_name][ccd]['WCS'].all_world2pix(
-                        self.gal_pos[:, 0][ind_obj],
-                        self.gal_pos[:, 1][ind_obj],
+                        sorted_pos[start:end, 0],
+                        sorted_pos[start:end, 1],
                         0,
                     )
                 ).T
@@ -644,39 +820,27 @@ class PSFExInterpolator(object):
                     )
                     continue
 
-                if array_psf is None:
-                    array_psf = np.copy(self.interp_PSFs)
-                else:
-                    array_psf = np.concatenate(
-                        (array_psf, np.copy(self.interp_PSFs))
-                    )
-
-                if array_id is None:
-                    array_id = np.copy(obj_id)
-                else:
-                    array_id = np.concatenate((array_id, np.copy(obj_id)))
-
+                list_psf.append(self.interp_PSFs)
+                list_id.append(obj_id)
                 if self._compute_shape:
                     self._get_psfshapes()
-                    if array_shape is None:
-                        array_shape = np.copy(self.psf_shapes)
-                    else:
-                        array_shape = np.concatenate((
-                            array_shape,
-                            np.copy(self.psf_shapes),
-                        ))
-                else:
-                    array_shape = None
-
-                exp_name_tmp = np.array([
-                    exp_name + '-' + str(ccd) for _ in range(len(obj_id))
-                ])
-                if array_exp_name is None:
-                    array_exp_name = exp_name_tmp
-                else:
-                    array_exp_name = np.concatenate(
-                        (array_exp_name, exp_name_tmp)
-                    )
+                    list_shape.append(self.psf_shapes)
+                list_exp_name.append(
+                    np.full(len(obj_id), f'{exp_name}-{ccd}')
+                )
+
+            if list_id:
+                array_id = np.concatenate(list_id)
+                array_psf = np.concatenate(list_psf)
+                array_exp_name = np.concatenate(list_exp_name)
+            else:
+                array_id = None
+                array_psf = None
+                array_exp_name = None
+            if list_shape:
+                array_shape = np.concatenate(list_shape)
+            else:
+                array_shape = None
 
             final_list.append([
                 array_id,
@@ -688,34 +852,35 @@ class PSFExInterpolator(object):
         self._f_wcs_file.close()
         cat.close()
 
+        # Map object Ids to their first index in the results of each epoch
+        epoch_index = []
+        for array_id, _, _, _ in final_list:
+            if array_id is None:
+                epoch_index.append({})
+            else:
+                uniq_id, uniq_idx = np.unique(array_id, return_index=True)
+                epoch_index.append(dict(zip(uniq_id, uniq_idx)))
+
         output_dict = {}
         n_empty = 0
         for id_tmp in all_id:
             output_dict[id_tmp] = {}
             counter = 0
-            for j in range(len(final_list)):
-                where_res = np.where(final_list[j][0] == id_tmp)[0]
-                if (len(where_res) != 0):
-                    output_dict[id_tmp][final_list[j][3][where_res[0]]] = {}
+            for j, id_index in enumerate(epoch_index):
+                if id_tmp in id_index:
+                    idx = id_index[id_tmp]
+                    output_dict[id_tmp][final_list[j][3][idx]] = {}
                     output_dict[id_tmp][
-                        final_list[j][3][where_res[0]]
-                    ]['VIGNET'] = final_list[j][1][where_res[0]]
+                        final_list[j][3][idx]
+                    ]['VIGNET'] = final_list[j][1][idx]
                     if self._compute_shape:
                         shape_dict = {}
-                        shape_dict['E1_PSF_HSM'] = (
-                            final_list[j][2][where_res[0]][0]
-                        )
-                        shape_dict['E2_PSF_HSM'] = (
-                            final_list[j][2][where_res[0]][1]
-                        )
-                        shape_dict['SIGMA_PSF_HSM'] = (
-                            final_list[j][2][where_res[0]][2]
-                        )
-                        shape_dict['FLAG_PSF_HSM'] = (
-                            final_list[j][2][where_res[0]][3]
-                        )
+                        shape_dict['E1_PSF_HSM'] = final_list[j][2][idx][0]
+                        shape_dict['E2_PSF_HSM'] = final_list[j][2][idx][1]
+                        shape_dict['SIGMA_PSF_HSM'] = final_list[j][2][idx][2]
+                        shape_dict['FLAG_PSF_HSM'] = final_list[j][2][idx][3]
                         output_dict[id_tmp][
-                            final_list[j][3][where_res[0]]
+                            final_list[j][3][idx]
                         ]['SHAPES'] = shape_dict
                     counter += 1
             if counter == 0:
@@ -738,7 +903,7 @@ class PSFExInterpolator(object):
 
         """
         output_file = SqliteDict(
-            self._output_path + self._img_number + '.sqlite'
+            f'{self._output_path}{self._img_number}.sqlite'
         )
         for idx in output_dict.keys():
             output_file[str(idx)] = output_dict[idx]
@@ -17,7 +17,7 @@ from shapepipe.pipeline.run_log import get_last_dir
     input_module=['psfex_runner', 'setools_runner'],
     file_pattern=['star_selection', 'galaxy_selection'],
     file_ext=['.psf', '.fits'],
-    depends=['numpy', 'astropy', 'galsim', 'sqlitedict'],
+    depends=['numpy', 'astropy', 'galsim', 'joblib', 'sqlitedict'],
 )
 def psfex_interp_runner(
     input_file_list,
@@ -35,6 +35,10 @@ def psfex_interp_runner(
     get_shapes = config.getboolean(module_config_sec, 'GET_SHAPES')
     star_thresh = config.getint(module_config_sec, 'STAR_THRESH')
     chi2_thresh = config.getint(module_config_sec, 'CHI2_THRESH')
+    if config.has_option(module_config_sec, 'N_JOBS'):
+        n_jobs = config.getint(module_config_sec, 'N_JOBS')
+    else:
+        n_jobs = 1
 
     # Run in CLASSIC mode
     if mode == 'CLASSIC':
@@ -53,6 +57,7 @@ def psfex_interp_runner(
             get_shapes,
             star_thresh,
             chi2_thresh,
+            n_jobs,
         )
 
         # Process inputs
@@ -87,6 +92,7 @@ def psfex_interp_runner(
             get_shapes,
             star_thresh,
             chi2_thresh,
+            n_jobs,
         )
 
         # Process inputs multi-epoch
@@ -109,6 +115,7 @@ def psfex_interp_runner(
             get_shapes,
             star_thresh,
             chi2_thresh,
+            n_jobs,
         )
 
         # Process inputs validation
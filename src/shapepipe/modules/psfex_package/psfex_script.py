@@ -120,15 +120,14 @@ class PSFExCaller:
             Updated standard output and error
 
         """
-        check_error = re.findall('error', stdout.lower())
-        check_error2 = re.findall('all done', stdout.lower())
+        stdout_lower = stdout.lower()
 
-        if check_error == []:
-            stderr2 = ''
-        else:
+        if 'error' in stdout_lower:
             stderr2 = stdout
+        else:
+            stderr2 = ''
 
-        if check_error2 == []:
+        if 'all done' not in stdout_lower:
             stderr2 = stdout
 
         return stdout, stderr2
@@ -7,18 +7,33 @@ catalogues.
 
 """
 
+import io
 import operator
 import os
 import re
 import string
+from concurrent.futures import ThreadPoolExecutor
 
-import matplotlib.pylab as plt
 import numpy as np
 
 from shapepipe.pipeline import file_io
 from shapepipe.pipeline.str_handler import StrInterpreter
 from shapepipe.utilities.file_system import mkdir
 
+# Patterns used to parse the SETools config file
+_RE_SECTION = re.compile(r'\[|\]')
+_RE_SECTION_NAME = re.compile(':')
+_RE_ASSIGN = re.compile('=')
+_RE_KEY_INDEX = re.compile('_')
+_RE_LIST = re.compile(',')
+_RE_MASK_REF = re.compile('{|}')
+_RE_INTERP = re.compile('@([^@]+)@')
+# Characters removed from config file lines
+_STRIP_TABLE = str.maketrans('', '', '\n\t')
+
+# matplotlib.pyplot, only imported when a plot is made
+_plt = None
+
 
 class SETools(object):
     """The SETools Class.
@@ -89,67 +104,187 @@ class SETools(object):
 
         self.read()
 
-        # Processing: Create mask = filter input
+        # Masks come first as the other sections can refer to them
         if len(self._mask) != 0:
-            direc = f'{self._output_dir}/mask'
-            mkdir(direc)
-            self._make_mask()
-            for key in self.mask.keys():
-                if 'NO_SAVE' in self._mask[key]:
-                    continue
-                file_name = f'{direc}/{key}{file_number}.fits'
-                self.save_mask(self.mask[key], file_name)
-
-        if len(self._plot) != 0:
-            direc = f'{self._output_dir}/plot'
-            mkdir(direc)
-            self._make_plot()
-            for key in self.plot.keys():
-                output_path = f'{direc}/{key}{file_number}'
-                SEPlot(self.plot[key], self._data, output_path, self.mask)
-
-        if len(self._new_cat) != 0:
-            direc = f'{self._output_dir}/new_cat'
-            mkdir(direc)
-            self._make_new_cat()
-            for key in self.new_cat.keys():
-                file_name = f'{direc}/{key}{file_number}'
-                self.save_new_cat(self.new_cat[key], file_name)
-
-        if len(self._rand_split) != 0:
-            direc = f'{self._output_dir}/rand_split'
-            mkdir(direc)
-            self._make_rand_split()
-
-            for sample_type in self.rand_split.keys():
-                empty_found = False
-                for ratio in self.rand_split[sample_type].keys():
-                    if (
-                        not empty_found
-                        and len(self.rand_split[sample_type][ratio]) == 0
-                    ):
-                        empty_found = True
-                if empty_found:
-                    w_log.info(
-                        'At least one random-split catalogue is empty, no '
-                        + 'random sub-samples written for sample_type='
-                        + f'{sample_type}')
-                    continue
-
-                output_dir = f'{direc}/{sample_type}_'
-                self.save_rand_split(
-                    self.rand_split[sample_type],
-                    output_dir,
+            self._run_section('mask', self._process_mask, file_number, w_log)
+
+        # The other sections are independent and mostly write files, they run
+        # in threads while the plots, i.e. matplotlib, stay in this thread
+        sections = [
+            ('new_cat', self._new_cat, self._process_new_cat),
+            ('rand_split', self._rand_split, self._process_rand_split),
+            ('stat', self._stat, self._process_stat),
+        ]
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {
+                name: executor.submit(
+                    self._run_section,
+                    name,
+                    process_section,
                     file_number,
+                    w_log,
                 )
+                for name, section, process_section in sections
+                if len(section) != 0
+            }
+            try:
+                if len(self._plot) != 0:
+                    self._run_section(
+                        'plot',
+                        self._process_plot,
+                        file_number,
+                        w_log,
+                    )
+            finally:
+                # Wait for every section, so that none of their errors is
+                # lost if the plots or another section fail
+                errors = {
+                    name: future.exception()
+                    for name, future in futures.items()
+                }
+                for name, error in errors.items():
+                    if error is not None:
+                        w_log.error(f'SETools section {name} failed: {error}')
+
+        for error in errors.values():
+            if error is not None:
+                raise error
+
+    def _run_section(self, name, process_section, file_number, w_log):
+        """Run Section.
+
+        Create the output directory of a section and process it.
+
+        Parameters
+        ----------
+        name : str
+            Section name, used as output sub-directory
+        process_section : callable
+            Section processing method
+        file_number : str
+            Input catalogue number/specifier
+        w_log : logging.Logger
+            Logging instance
+
+        """
+        direc = os.path.join(self._output_dir, name)
+        mkdir(direc)
+        process_section(direc, file_number, w_log)
+
+    def _process_mask(self, direc, file_number, w_log):
+        """Process Mask.
+
+        Create the masks, i.e. filter the input, and save them.
+
+        Parameters
+        ----------
+        direc : str
+            Output directory of the section
+        file_number : str
+            Input catalogue number/specifier
+        w_log : logging.Logger
+            Logging instance
+
+        """
+        self._make_mask()
+        for key, mask in self.mask.items():
+            if 'NO_SAVE' in self._mask[key]:
+                continue
+            file_name = os.path.join(direc, f'{key}{file_number}.fits')
+            self.save_mask(mask, file_name)
 
-        if len(self._stat) != 0:
-            direc = f'{self._output_dir}/stat'
-            mkdir(direc)
-            self._make_stat()
-            for key in self.stat.keys():
-                output_path = f'{direc}/{key}{file_number}.txt'
-                self.save_stat(self.stat[key], output_path)
+    def _process_plot(self, direc, file_number, w_log):
+        """Process Plot.
+
+        Create the plots.
+
+        Parameters
+        ----------
+        direc : str
+            Output directory of the section
+        file_number : str
+            Input catalogue number/specifier
+        w_log : logging.Logger
+            Logging instance
+
+        """
+        self._make_plot()
+        for key, plot in self.plot.items():
+            output_path = os.path.join(direc, f'{key}{file_number}')
+            SEPlot(
+                plot,
+                self._data,
+                output_path,
+                self.mask,
+                interp_cache=self._interp_cache,
+            )
+
+    def _process_new_cat(self, direc, file_number, w_log):
+        """Process New Catalogue.
+
+        Create the new catalogues and save them.
+
+        Parameters
+        ----------
+        direc : str
+            Output directory of the section
+        file_number : str
+            Input catalogue number/specifier
+        w_log : logging.Logger
+            Logging instance
+
+        """
+        self._make_new_cat()
+        for key, new_cat in self.new_cat.items():
+            file_name = os.path.join(direc, f'{key}{file_number}')
+            self.save_new_cat(new_cat, file_name)
+
+    def _process_rand_split(self, direc, file_number, w_log):
+        """Process Random Split.
+
+        Create the random splits and save them.
+
+        Parameters
+        ----------
+        direc : str
+            Output directory of the section
+        file_number : str
+            Input catalogue number/specifier
+        w_log : logging.Logger
+            Logging instance
+
+        """
+        self._make_rand_split()
+        for sample_type, rand_split in self.rand_split.items():
+            if any(len(sample) == 0 for sample in rand_split.values()):
+                w_log.info(
+                    'At least one random-split catalogue is empty, no '
+                    + 'random sub-samples written for sample_type='
+                    + f'{sample_type}')
+                continue
+
+            output_dir = os.path.join(direc, f'{sample_type}_')
+            self.save_rand_split(rand_split, output_dir, file_number)
+
+    def _process_stat(self, direc, file_number, w_log):
+        """Process Statistics.
+
+        Compute the statistics and save them.
+
+        Parameters
+        ----------
+        direc : str
+            Output directory of the section
+        file_number : str
+            Input catalogue number/specifier
+        w_log : logging.Logger
+            Logging instance
+
+        """
+        self._make_stat()
+        for key, stat in self.stat.items():
+            output_path = os.path.join(direc, f'{key}{file_number}.txt')
+            self.save_stat(stat, output_path)
 
     def read(self):
         """Read the Configuration File.
@@ -169,16 +304,22 @@ class SETools(object):
 
         self._mask = {}
         self._mask_key = []
+        self.mask = {}
+        self._interp_cache = {}
         self._plot = {}
         self._stat = {}
         self._new_cat = {}
         self._rand_split = {}
-        in_section = 0
-        while True:
-            line_tmp = self._config_file.readline()
-
-            if line_tmp == '':
-                break
+        # Section type: (section dictionary, default name prefix)
+        sections = {
+            'MASK': (self._mask, 'mask'),
+            'PLOT': (self._plot, 'plot'),
+            'STAT': (self._stat, 'stat'),
+            'NEW_CAT': (self._new_cat, 'new_cat'),
+            'RAND_SPLIT': (self._rand_split, 'rand_split'),
+        }
+        section_lines = None
+        for line_tmp in self._config_file:
 
             line_tmp = self._clean_line(line_tmp)
 
@@ -189,67 +330,31 @@ class SETools(object):
             # [SECTION_TYPE:OBJECT_NAME], e.g.
             # [MASK:star_selection]
 
-            if (in_section != 0) & (re.split(r'\[', line_tmp)[0] == ''):
-                in_section = 0
-            if not in_section:
-                if (re.split(r'\[', line_tmp)[0] != ''):
+            is_header = line_tmp.startswith('[')
+            if is_header:
+                section_lines = None
+            if section_lines is None:
+                if not is_header:
                     raise RuntimeError('No section found')
 
-                sec = re.split(r'\[|\]', line_tmp)[1]
-                if re.split(':', sec)[0] == 'MASK':
-                    in_section = 1
-                    try:
-                        mask_name = re.split(':', sec)[1]
-                    except Exception:
-                        mask_name = f'mask_{len(self._mask) + 1}'
-                    self._mask_key.append(mask_name)
-                    self._mask[mask_name] = []
-                elif re.split(':', sec)[0] == 'PLOT':
-                    in_section = 2
-                    try:
-                        plot_name = re.split(':', sec)[1]
-                    except Exception:
-                        plot_name = f'plot_{len(self._plot) + 1}'
-                    self._plot[plot_name] = []
-                elif re.split(':', sec)[0] == 'STAT':
-                    in_section = 3
-                    try:
-                        stat_name = re.split(':', sec)[1]
-                    except Exception:
-                        stat_name = f'stat_{len(self._stat) + 1}'
-                    self._stat[stat_name] = []
-                elif re.split(':', sec)[0] == 'NEW_CAT':
-                    in_section = 4
-                    try:
-                        new_cat_name = re.split(':', sec)[1]
-                    except Exception:
-                        new_cat_name = f'new_cat_{len(self._new_cat) + 1}'
-                    self._new_cat[new_cat_name] = []
-                elif re.split(':', sec)[0] == 'RAND_SPLIT':
-                    in_section = 5
-                    try:
-                        rand_split_name = re.split(':', sec)[1]
-                    except Exception:
-                        rand_split_name = (
-                            f'rand_split_{len(self._rand_split) + 1}'
-                        )
-                    self._rand_split[rand_split_name] = []
-                else:
+                sec = _RE_SECTION.split(line_tmp)[1]
+                sec_split = _RE_SECTION_NAME.split(sec)
+                if sec_split[0] not in sections:
                     raise ValueError(
                         "Section has to be in ['MASK','PLOT','STAT',"
                         + "'NEW_CAT','RAND_SPLIT','FLAG_SPLIT']"
                     )
+                section, prefix = sections[sec_split[0]]
+                if len(sec_split) > 1:
+                    name = sec_split[1]
+                else:
+                    name = f'{prefix}_{len(section) + 1}'
+                if sec_split[0] == 'MASK':
+                    self._mask_key.append(name)
+                section[name] = []
+                section_lines = section[name]
             else:
-                if in_section == 1:
-                    self._mask[mask_name].append(line_tmp)
-                elif in_section == 2:
-                    self._plot[plot_name].append(line_tmp)
-                elif in_section == 3:
-                    self._stat[stat_name].append(line_tmp)
-                elif in_section == 4:
-                    self._new_cat[new_cat_name].append(line_tmp)
-                elif in_section == 5:
-                    self._rand_split[rand_split_name].append(line_tmp)
+                section_lines.append(line_tmp)
 
     def _clean_line(self, line):
         """Clean Lines.
@@ -269,18 +374,13 @@ class SETools(object):
             ``None`` otherwise
 
         """
-        s = re.split('"', line)
+        s = line.split('"')
         if len(s) == 3:
             line_tmp = s[0].replace(' ', '') + s[1] + s[2].replace(' ', '')
         else:
             line_tmp = line.replace(' ', '')
 
-        if re.split('#', line_tmp)[0] == '':
-            return None
-
-        line_tmp = line_tmp.replace('\n', '')
-        line_tmp = line_tmp.replace('\t', '')
-        line_tmp = re.split('#', line_tmp)[0]
+        line_tmp = line_tmp.translate(_STRIP_TABLE).partition('#')[0]
 
         if line_tmp != '':
             return line_tmp
@@ -376,23 +476,19 @@ class SETools(object):
                 sex_cat_path=self._cat_filepath,
             )
         elif (output_format == 'txt') | (output_format == 'ascii'):
-            new_file = open(output_path + '.txt', 'w')
-            new_file.write('# HEADER\n')
-            new_file.write('# ')
-            n_max = -1
-            for key in new_cat.keys():
-                if len(new_cat[key]) > n_max:
-                    n_max = len(new_cat[key])
-                new_file.write(f'{key}\t')
-            new_file.write('\n')
-            for idx in range(n_max):
-                for key in new_cat.keys():
-                    try:
-                        new_file.write(f'{new_cat[key][idx]}\t')
-                    except Exception:
-                        new_file.write('\t')
-                new_file.write('\n')
-            new_file.close()
+            n_max = max((len(col) for col in new_cat.values()), default=0)
+            # Format the columns, padding the short ones with empty cells
+            cols = [
+                [str(val) for val in col] + [''] * (n_max - len(col))
+                for col in new_cat.values()
+            ]
+            header = ''.join(f'{key}\t' for key in new_cat.keys())
+            with open(output_path + '.txt', 'w') as new_file:
+                new_file.write(f'# HEADER\n# {header}\n')
+                new_file.writelines(
+                    ''.join(f'{val}\t' for val in row) + '\n'
+                    for row in zip(*cols)
+                )
         else:
             raise ValueError("Format should be in ['fits', 'SEx_cat', 'txt']")
 
@@ -435,8 +531,9 @@ class SETools(object):
         if file_number is None:
             raise ValueError('file_number path not provided')
 
-        mask = rand_split.pop('mask')
-        data = self._data[mask]
+        # Convert the split indices, relative to the masked catalogue, to
+        # indices of the full catalogue so that each row is copied only once
+        mask_ind = np.flatnonzero(rand_split.pop('mask'))
 
         for idx in rand_split.keys():
             rand_split_file = file_io.FITSCatalogue(
@@ -445,7 +542,7 @@ class SETools(object):
                 SEx_catalogue=(self._cat_filepath is not None),
             )
             rand_split_file.save_as_fits(
-                data=data[rand_split[idx]],
+                data=self._data[mask_ind[rand_split[idx]]],
                 ext_name=ext_name,
                 sex_cat_path=self._cat_filepath,
             )
@@ -475,13 +572,38 @@ class SETools(object):
         if output_path is None:
             raise ValueError('output path not provided')
 
-        file = open(output_path, 'w')
-        file.write('# Statistics\n')
+        with open(output_path, 'w') as stat_file:
+            stat_file.write('# Statistics\n')
+            stat_file.writelines(
+                f'{key} = {str(value)}\n' for key, value in stat.items()
+            )
 
-        for key in stat.keys():
-            file.write(f'{key} = {str(stat[key])}\n')
+    def _interpret(self, expr):
+        """Interpret.
 
-        file.close()
+        Interpret an expression on the full catalogue. Results are cached as
+        the same expression often appears in several sections.
+
+        Parameters
+        ----------
+        expr : str
+            Expression to interpret
+
+        Returns
+        -------
+        numpy.ndarray or float
+            Result of the expression
+
+        """
+        if expr not in self._interp_cache:
+            self._interp_cache[expr] = StrInterpreter(
+                expr,
+                self._data,
+                make_compare=False,
+                mask_dict=self.mask,
+            ).result
+
+        return self._interp_cache[expr]
 
     def _make_mask(self):
         """Make Mask.
@@ -499,33 +621,37 @@ class SETools(object):
             return None
 
         self.mask = {}
+        self._interp_cache.clear()
 
         for key in self._mask_key:
             global_mask = np.ones(self._cat_size, dtype=bool)
-            global_ind = np.where(global_mask)[0]
             for idx in self._mask[key]:
-                s = re.split('{|}', idx)
+                s = _RE_MASK_REF.split(idx)
                 if s[0] == '':
                     try:
                         global_mask &= self.mask[s[1]]
-                        global_ind = np.where(global_mask)[0]
                         self._mask[key].pop(self._mask[key].index(idx))
                     except Exception:
                         raise RuntimeError(f'"{s[1]}" not found in mask')
 
-            mask_tmp = None
-            for idx in self._mask[key]:
-                if idx == 'NO_SAVE':
-                    continue
-                tmp = StrInterpreter(
+            # Select the data of the parent masks only once
+            global_ind = np.flatnonzero(global_mask)
+            masked_data = self._data[global_mask]
+            clauses = [
+                StrInterpreter(
                     idx,
-                    self._data[global_mask],
+                    masked_data,
                     make_compare=True,
                     mask_dict=self.mask,
                 ).result
-                if mask_tmp is None:
-                    mask_tmp = np.ones(tmp.shape[0], dtype=bool)
-                mask_tmp &= tmp
+                for idx in self._mask[key]
+                if idx != 'NO_SAVE'
+            ]
+            # Combine all the conditions in a single pass
+            if clauses:
+                mask_tmp = np.logical_and.reduce(clauses)
+            else:
+                mask_tmp = np.ones(len(global_ind), dtype=bool)
 
             new_ind = global_ind[mask_tmp]
             final_mask = np.zeros(self._cat_size, dtype=bool)
@@ -553,13 +679,13 @@ class SETools(object):
         for key in self._plot.keys():
             self.plot[key] = {}
             for idx in self._plot[key]:
-                s = re.split('=', idx)
+                s = _RE_ASSIGN.split(idx)
                 if len(s) != 2:
                     raise ValueError(
                         'Plot option keyword/value not in correct format '
                         + f'(key=val): {idx}'
                     )
-                ss = re.split('_', s[0])
+                ss = _RE_KEY_INDEX.split(s[0])
                 if len(ss) == 1:
                     self.plot[key][ss[0]] = {'0': s[1]}
                 elif len(ss) == 2:
@@ -591,17 +717,12 @@ class SETools(object):
         for key in self._new_cat.keys():
             self.new_cat[key] = {}
             for idx in self._new_cat[key]:
-                s = re.split('=', j)
+                s = _RE_ASSIGN.split(idx)
                 if len(s) == 2:
                     if s[0] == 'OUTPUT_FORMAT':
                         self.new_cat[key][s[0]] = s[1]
                     else:
-                        self.new_cat[key][s[0]] = StrInterpreter(
-                            s[1],
-                            self._data,
-                            make_compare=False,
-                            mask_dict=self.mask,
-                        ).result
+                        self.new_cat[key][s[0]] = self._interpret(s[1])
                 else:
                     raise ValueError(f'Not a valid format : {idx}')
 
@@ -629,7 +750,7 @@ class SETools(object):
         for key in self._rand_split.keys():
             self.rand_split[key] = {}
             for idx in self._rand_split[key]:
-                s = re.split('=', idx)
+                s = _RE_ASSIGN.split(idx)
                 if len(s) != 2:
                     raise ValueError(
                         f'Not a valid format : {self._rand_split[key][0]}'
@@ -642,22 +763,18 @@ class SETools(object):
                     if ratio >= 1:
                         ratio /= 100.
                 elif s[0] == 'MASK':
-                    ss = re.split(',', s[1])
+                    ss = _RE_LIST.split(s[1])
                     for k in ss:
                         try:
                             mask &= self.mask[k]
                         except Exception:
                             raise ValueError(f'mask {k} does not exist')
 
-            cat_size = len(np.where(mask)[0])
+            cat_size = np.count_nonzero(mask)
             n_keep = int(np.ceil(cat_size * ratio))
-            mask_ratio = []
-            mask_left = list(range(0, cat_size))
-            while len(mask_ratio) != n_keep:
-                idx = np.random.randint(0, len(mask_left))
-                mask_ratio.append(mask_left.pop(idx))
-            mask_ratio = np.array(mask_ratio)
-            mask_left = np.array(mask_left)
+            perm = np.random.permutation(cat_size)
+            mask_ratio = perm[:n_keep]
+            mask_left = np.sort(perm[n_keep:])
             self.rand_split[key]['mask'] = mask
             self.rand_split[key][f'ratio_{int(ratio * 100)}'] = mask_ratio
             self.rand_split[key][f'ratio_{100 - int(ratio * 100)}'] = mask_left
@@ -680,15 +797,32 @@ class SETools(object):
         for key in self._stat.keys():
             self.stat[key] = {}
             for idx in self._stat[key]:
-                s = re.split('=', idx)
+                s = _RE_ASSIGN.split(idx)
                 if len(s) != 2:
                     raise ValueError(f'Not a valid format : {idx}')
-                self.stat[key][s[0]] = StrInterpreter(
-                    s[1],
-                    self._data,
-                    make_compare=False,
-                    mask_dict=self.mask,
-                ).result
+                self.stat[key][s[0]] = self._interpret(s[1])
+
+
+def _get_pyplot():
+    """Get Pyplot.
+
+    Import ``matplotlib.pyplot`` with the ``agg`` backend on first use, so
+    that configurations without plots do not pay for the import.
+
+    Returns
+    -------
+    module
+        The ``matplotlib.pyplot`` module
+
+    """
+    global _plt
+    if _plt is None:
+        import matplotlib as mpl
+        mpl.use('agg')
+        import matplotlib.pyplot as plt
+        _plt = plt
+
+    return _plt
 
 
 class SEPlot(object):
@@ -706,6 +840,9 @@ class SEPlot(object):
         Path for the output
     mask_dict : dict, optional
         Dictionary containing masks to apply
+    interp_cache : dict, optional
+        Cache of interpreted expressions shared with the caller, the
+        expressions are interpreted on ``catalogue`` with ``mask_dict``
 
     Raises
     ------
@@ -726,7 +863,14 @@ class SEPlot(object):
 
     """
 
-    def __init__(self, plot_dict, catalogue, output_path, mask_dict=None):
+    def __init__(
+        self,
+        plot_dict,
+        catalogue,
+        output_path,
+        mask_dict=None,
+        interp_cache=None,
+    ):
 
         if plot_dict is None:
             raise ValueError('plot_dict not provided')
@@ -739,6 +883,10 @@ class SEPlot(object):
         self._output_path = output_path
         self._cat = catalogue
         self._mask_dict = mask_dict
+        self._plt = _get_pyplot()
+        if interp_cache is None:
+            interp_cache = {}
+        self._interp_cache = interp_cache
 
         if 'TYPE' not in self._plot.keys():
             raise ValueError('Plot type not specified')
@@ -783,6 +931,75 @@ class SEPlot(object):
                     + f'\'{self._plot["TYPE"]["0"]}\''
                 )
 
+    def _interpret(self, expr):
+        """Interpret.
+
+        Interpret an expression on the catalogue, reusing the cached result
+        if available.
+
+        Parameters
+        ----------
+        expr : str
+            Expression to interpret
+
+        Returns
+        -------
+        numpy.ndarray or float
+            Result of the expression
+
+        """
+        if expr not in self._interp_cache:
+            self._interp_cache[expr] = StrInterpreter(
+                expr,
+                self._cat,
+                make_compare=False,
+                mask_dict=self._mask_dict,
+            ).result
+
+        return self._interp_cache[expr]
+
+    def _interpolate(self, text):
+        """Interpolate.
+
+        Replace each expression between ``@`` in a title or label by its
+        value.
+
+        Parameters
+        ----------
+        text : str
+            Text to interpolate
+
+        Returns
+        -------
+        str
+            Interpolated text
+
+        """
+        return _RE_INTERP.sub(
+            lambda match: str(self._interpret(match.group(1))),
+            text,
+        )
+
+    def _save_figure(self, out_format):
+        """Save Figure.
+
+        Render the figure in memory and write it to the output file in a
+        single call.
+
+        Parameters
+        ----------
+        out_format : str
+            Output file format
+
+        """
+        buffer = io.BytesIO()
+        self._fig.savefig(buffer, format=out_format)
+        self._plt.close()
+
+        output_path = f'{self._output_path}.{out_format.lower()}'
+        with open(output_path, 'wb') as plot_file:
+            plot_file.write(buffer.getbuffer())
+
     def _make_plot(self):
         """Make Plot.
 
@@ -800,25 +1017,10 @@ class SEPlot(object):
         matplotlib.pyplot.plot
 
         """
-        self._fig = plt.figure()
+        self._fig = self._plt.figure()
 
         if 'TITLE' in self._plot.keys():
-            title = self._plot['TITLE']['0']
-            s = re.split('@', title)
-            if len(s) >= 3:
-                title = s[0]
-                ii = 1
-                for idx in s[1:-1]:
-                    if ii % 2 == 0:
-                        title += idx
-                    else:
-                        title += str(StrInterpreter(
-                            idx,
-                            self._cat,
-                            make_compare=False,
-                            mask_dict=self._mask_dict,
-                        ).result)
-                    ii += 1
+            title = self._interpolate(self._plot['TITLE']['0'])
         else:
             title = ''
 
@@ -827,22 +1029,7 @@ class SEPlot(object):
         for key in self._plot['Y'].keys():
             if 'LABEL' in self._plot.keys():
                 try:
-                    label = self._plot['LABEL'][key]
-                    s = re.split('@', label)
-                    if len(s) >= 3:
-                        label = s[0]
-                        jj = 1
-                        for j in s[1:-1]:
-                            if jj % 2 == 0:
-                                label += j
-                            else:
-                                label += str(StrInterpreter(
-                                    j,
-                                    self._cat,
-                                    make_compare=False,
-                                    mask_dict=self._mask_dict,
-                                ).result)
-                            jj += 1
+                    label = self._interpolate(self._plot['LABEL'][key])
                 except Exception:
                     label = None
             else:
@@ -894,13 +1081,9 @@ class SEPlot(object):
                         + 'dont have the same'
                     )
 
-            plt.plot(
-                StrInterpreter(x, self._cat, mask_dict=self._mask_dict).result,
-                StrInterpreter(
-                    self._plot['Y'][key],
-                    self._cat,
-                    mask_dict=self._mask_dict,
-                ).result,
+            self._plt.plot(
+                self._interpret(x),
+                self._interpret(self._plot['Y'][key]),
                 label=label,
                 color=color,
                 marker=marker,
@@ -911,10 +1094,13 @@ class SEPlot(object):
             )
 
         # Set ploy limits for x and y
-        for (lim, set_lim) in zip(['XLIM', 'YLIM'], [plt.xlim, plt.ylim]):
+        for (lim, set_lim) in zip(
+            ['XLIM', 'YLIM'],
+            [self._plt.xlim, self._plt.ylim],
+        ):
             if lim in self._plot.keys():
                 try:
-                    val = re.split(',', self._plot[lim]['0'])
+                    val = _RE_LIST.split(self._plot[lim]['0'])
                 except Exception:
                     raise ValueError(
                         f'Plot {lim} keyword/value not in correct format '
@@ -924,23 +1110,19 @@ class SEPlot(object):
                 set_lim(float(val[0]), float(val[1]))
 
         if 'LABEL' in self._plot.keys():
-            plt.legend()
+            self._plt.legend()
 
         if 'XLABEL' in self._plot.keys():
-            plt.xlabel(self._plot['XLABEL']['0'])
+            self._plt.xlabel(self._plot['XLABEL']['0'])
         if 'YLABEL' in self._plot.keys():
-            plt.ylabel(self._plot['YLABEL']['0'])
+            self._plt.ylabel(self._plot['YLABEL']['0'])
 
         if 'FORMAT' in self._plot.keys():
             out_format = self._plot['FORMAT']['0']
         else:
             out_format = "PNG"
 
-        self._fig.savefig(
-            f'{self._output_path}.{out_format.lower()}',
-            format=out_format,
-        )
-        plt.close()
+        self._save_figure(out_format)
 
     def _make_scatter(self):
         """Make Scatter.
@@ -959,25 +1141,10 @@ class SEPlot(object):
         matplotlib.pyplot.scatter
 
         """
-        self._fig = plt.figure()
+        self._fig = self._plt.figure()
 
         if 'TITLE' in self._plot.keys():
-            title = self._plot['TITLE']['0']
-            s = re.split('@', title)
-            if len(s) >= 3:
-                title = s[0]
-                counter = 1
-                for idx in s[1:-1]:
-                    if counter % 2 == 0:
-                        title += idx
-                    else:
-                        title += str(StrInterpreter(
-                            idx,
-                            self._cat,
-                            make_compare=False,
-                            mask_dict=self._mask_dict,
-                        ).result)
-                    counter += 1
+            title = self._interpolate(self._plot['TITLE']['0'])
         else:
             title = ''
 
@@ -986,22 +1153,7 @@ class SEPlot(object):
         for key in self._plot['SCATTER'].keys():
             if 'LABEL' in self._plot.keys():
                 try:
-                    label = self._plot['LABEL'][key]
-                    s = re.split('@', label)
-                    if len(s) >= 3:
-                        label = s[0]
-                        jj = 1
-                        for j in s[1:-1]:
-                            if jj % 2 == 0:
-                                label += j
-                            else:
-                                label += str(StrInterpreter(
-                                    j,
-                                    self._cat,
-                                    make_compare=False,
-                                    mask_dict=self._mask_dict,
-                                ).result)
-                            jj += 1
+                    label = self._interpolate(self._plot['LABEL'][key])
                 except Exception:
                     label = None
             else:
@@ -1042,14 +1194,10 @@ class SEPlot(object):
                         + 'they dont have the same'
                     )
 
-            plt.scatter(
-                StrInterpreter(x, self._cat, mask_dict=self._mask_dict).result,
-                StrInterpreter(y, self._cat, mask_dict=self._mask_dict).result,
-                c=StrInterpreter(
-                    self._plot['SCATTER'][key],
-                    self._cat,
-                    mask_dict=self._mask_dict,
-                ).result,
+            self._plt.scatter(
+                self._interpret(x),
+                self._interpret(y),
+                c=self._interpret(self._plot['SCATTER'][key]),
                 label=label,
                 marker=marker,
                 alpha=alpha,
@@ -1057,24 +1205,20 @@ class SEPlot(object):
             )
 
         if 'LABEL' in self._plot.keys():
-            plt.legend()
+            self._plt.legend()
         if 'XLABEL' in self._plot.keys():
-            plt.xlabel(self._plot['XLABEL']['0'])
+            self._plt.xlabel(self._plot['XLABEL']['0'])
         if 'YLABEL' in self._plot.keys():
-            plt.ylabel(self._plot['YLABEL']['0'])
+            self._plt.ylabel(self._plot['YLABEL']['0'])
 
-        plt.colorbar()
+        self._plt.colorbar()
 
         if 'FORMAT' in self._plot.keys():
             out_format = self._plot['FORMAT']['0']
         else:
             out_format = 'PNG'
 
-        self._fig.savefig(
-            f'{self._output_path}.{out_format.lower()}',
-            format=out_format,
-        )
-        plt.close()
+        self._save_figure(out_format)
 
     def _make_hist(self):
         """Make Hist.
@@ -1086,117 +1230,63 @@ class SEPlot(object):
         matplotlib.pyplot.hist
 
         """
-        self._fig = plt.figure()
+        self._fig = self._plt.figure()
 
-        if 'TITLE' in self._plot.keys():
-            title = self._plot['TITLE']['0']
-            s = re.split('@', title)
-            if len(s) >= 3:
-                title = s[0]
-                counter = 1
-                for idx in s[1:-1]:
-                    if counter % 2 == 0:
-                        title += idx
-                    else:
-                        title += str(StrInterpreter(
-                            idx,
-                            self._cat,
-                            make_compare=False,
-                            mask_dict=self._mask_dict,
-                        ).result)
-                    counter += 1
+        if 'TITLE' in self._plot:
+            title = self._interpolate(self._plot['TITLE']['0'])
         else:
             title = ''
 
         self._fig.suptitle(title)
 
-        if 'HTYPE' in self._plot.keys():
-            htype = self._plot['HTYPE']['0']
-        else:
-            htype = 'bar'
-        if 'LOG' in self._plot.keys():
-            if self._plot['LOG']['0'] in ['True', 'true', '1']:
-                log = True
-            else:
-                log = False
-        else:
-            log = False
+        htype = self._plot.get('HTYPE', {}).get('0', 'bar')
+        log = self._plot.get('LOG', {}).get('0') in ['True', 'true', '1']
 
-        for key in self._plot['Y'].keys():
-            if 'LABEL' in self._plot.keys():
+        # Options per Y series, looked up once
+        label_map = self._plot.get('LABEL', {})
+        color_map = self._plot.get('COLOR', {})
+        bin_map = self._plot.get('BIN', {})
+        alpha_map = self._plot.get('ALPHA', {})
+        bins = 50
+        if len(bin_map) == 1:
+            try:
+                bins = int(next(iter(bin_map.values())))
+            except ValueError:
+                pass
+
+        for key, y_expr in self._plot['Y'].items():
+            label = label_map.get(key)
+            if label is not None:
                 try:
-                    label = self._plot['LABEL'][key]
-                    s = re.split('@', label)
-                    if len(s) >= 3:
-                        label = s[0]
-                        jj = 1
-                        for j in s[1:-1]:
-                            if jj % 2 == 0:
-                                label += j
-                            else:
-                                label += str(StrInterpreter(
-                                    j,
-                                    self._cat,
-                                    make_compare=False,
-                                    mask_dict=self._mask_dict,
-                                ).result)
-                            jj += 1
+                    label = self._interpolate(label)
                 except Exception:
                     label = None
-            else:
-                label = None
-            if 'COLOR' in self._plot.keys():
-                try:
-                    color = self._plot['COLOR'][key]
-                except Exception:
-                    color = None
-            else:
-                color = None
-            if 'BIN' in self._plot.keys():
-                try:
-                    bins = int(self._plot['BIN'][key])
-                except Exception:
-                    if len(self._plot['BIN']) == 1:
-                        bins = int(
-                            self._plot['BIN'][self._plot['BIN'].keys()[0]]
-                        )
-            else:
-                bins = 50
-            if 'ALPHA' in self._plot.keys():
-                try:
-                    alpha = float(self._plot['ALPHA'][key])
-                except Exception:
-                    alpha = None
-            else:
+            # Missing or invalid BIN values keep the single or previous one
+            try:
+                bins = int(bin_map[key])
+            except (KeyError, ValueError):
+                pass
+            try:
+                alpha = float(alpha_map[key])
+            except (KeyError, ValueError):
                 alpha = None
 
-            plt.hist(
-                StrInterpreter(
-                    self._plot['Y'][key],
-                    self._cat,
-                    mask_dict=self._mask_dict,
-                ).result,
+            self._plt.hist(
+                self._interpret(y_expr),
                 bins=bins,
-                color=color,
+                color=color_map.get(key),
                 label=label,
                 alpha=alpha,
                 histtype=htype,
                 log=log,
             )
 
-        if 'LABEL' in self._plot.keys():
-            plt.legend()
-        if 'XLABEL' in self._plot.keys():
-            plt.xlabel(self._plot['XLABEL']['0'])
-        if 'YLABEL' in self._plot.keys():
-            plt.ylabel(self._plot['YLABEL']['0'])
-        if 'FORMAT' in self._plot.keys():
-            out_format = self._plot['FORMAT']['0']
-        else:
-            out_format = 'PNG'
+        if 'LABEL' in self._plot:
+            self._plt.legend()
+        if 'XLABEL' in self._plot:
+            self._plt.xlabel(self._plot['XLABEL']['0'])
+        if 'YLABEL' in self._plot:
+            self._plt.ylabel(self._plot['YLABEL']['0'])
+        out_format = self._plot.get('FORMAT', {}).get('0', 'PNG')
 
-        self._fig.savefig(
-            f'{self._output_path}.{out_format.lower()}',
-            format=out_format,
-        )
-        plt.close()
+        self._save_figure(out_format)
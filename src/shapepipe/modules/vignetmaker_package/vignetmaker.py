@@ -216,12 +216,22 @@ class VignetMaker(object):
         final_list = []
         for hdu_index in hdu_ind:
             exp_name = cat.get_data(hdu_index)['EXP_NAME'][0]
-            ccd_list = list(set(cat.get_data(hdu_index)['CCD_N']))
+            ccd_col = cat.get_data(hdu_index)['CCD_N']
+            # Group the objects by CCD with a single sort
+            ccd_order = np.argsort(ccd_col, kind='stable')
+            ccd_list, ccd_start = np.unique(
+                ccd_col[ccd_order],
+                return_index=True,
+            )
+            ccd_end = np.append(ccd_start[1:], len(ccd_col))
+            # Gather the ids and positions once, each CCD is then a slice
+            sorted_id = all_id[ccd_order]
+            sorted_pos = self._pos[ccd_order]
             array_vign = None
             array_id = None
             array_exp_name = None
 
-            for ccd in ccd_list:
+            for ccd, start, end in zip(ccd_list, ccd_start, ccd_end):
 
                 if ccd == -1:
                     continue
@@ -230,13 +240,12 @@ class VignetMaker(object):
                     image_dir + '/' + image_pattern + '-'
                     + exp_name + '-' + str(ccd) + '.fits'
                 )
-                ind_obj = np.where(cat.get_data(hdu_index)['CCD_N'] == ccd)[0]
-                obj_id = all_id[ind_obj]
+                obj_id = sorted_id[start:end]
 
                 wcs_file = self._f_wcs_file[exp_name][ccd]['WCS']
                 pos = np.array(wcs_file.all_world2pix(
-                    self._pos[:, 1][ind_obj],
-                    self._pos[:, 0][ind_obj],
+                    sorted_pos[start:end, 1],
+                    sorted_pos[start:end, 0],
                     1,
                 )).T
                 pos[:, [0, 1]] = pos[:, [1, 0]]
@@ -401,7 +410,7 @@ def make_mask(galcat_path, mask_value):
     """
     vignet = get_original_vignet(galcat_path)
 
-    vignet[np.where(vignet < -1e29)] = mask_value
+    vignet[vignet < -1e29] = mask_value
 
     return vignet
 
@@ -8,6 +8,7 @@ This module defines methods for running the pipeline modules.
 
 import os
 import subprocess as sp
+from functools import lru_cache
 
 
 def execute(command_line):
@@ -64,22 +65,59 @@ def check_executable(exe_name):
     if not isinstance(exe_name, str):
         raise TypeError('Executable name must be a string.')
 
-    def is_exe(fpath):
-        return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
-
     fpath, fname = os.path.split(exe_name)
 
     if not fpath:
-        res = any([
-            is_exe(os.path.join(path, exe_name))
-            for path in os.environ['PATH'].split(os.pathsep)
-        ])
+        res = _is_exe_in_path(exe_name, os.environ['PATH'])
 
     else:
-        res = is_exe(exe_name)
+        res = _is_exe(exe_name)
 
     if not res:
         raise OSError(
             f'{exe_name} does not appear to be a valid executable on this '
             + 'system.'
         )
+
+
+def _is_exe(fpath):
+    """Check if File is Executable.
+
+    Parameters
+    ----------
+    fpath : str
+        File path
+
+    Returns
+    -------
+    bool
+        Result of test
+
+    """
+    return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
+
+
+@lru_cache(maxsize=None)
+def _is_exe_in_path(exe_name, search_path):
+    """Check if Executable is in Search Path.
+
+    Results are cached per executable name and search path, which avoids
+    scanning all directories of ``PATH`` for every job.
+
+    Parameters
+    ----------
+    exe_name : str
+        Executable name
+    search_path : str
+        Search path, in the format of the ``PATH`` environment variable
+
+    Returns
+    -------
+    bool
+        Result of test
+
+    """
+    return any(
+        _is_exe(os.path.join(path, exe_name))
+        for path in search_path.split(os.pathsep)
+    )
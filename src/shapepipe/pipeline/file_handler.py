@@ -1018,32 +1018,6 @@ class FileHandler(object):
 
         del num_pattern_list
 
-    @staticmethod
-    def _get_file_name(path, pattern, number, ext):
-        """Get File Name.
-
-        Get file name corresponding to the path, file pattern, number pattern
-        and file extension.
-
-        Parameters
-        ----------
-        path : str
-            Path to file
-        pattern : str
-            File pattern
-        number : str
-            Number pattern
-        ext : str
-            File extension
-
-        Returns
-        -------
-        str
-            File name
-
-        """
-        return f'{path}/{pattern}{number}{ext}'
-
     @staticmethod
     def _remove_mmaps(mmap_list):
         """Remove Memory Maps.
@@ -1100,11 +1074,18 @@ class FileHandler(object):
         else:
             number_list = self._number_list
 
+        # Path and file pattern are the same for all numbers
+        prefix_ext_list = [
+            (f'{path}/{fp}', ext)
+            for path, fp, ext in zip(path_list, pattern_list, ext_list)
+        ]
+        number_re = re.compile(re_pattern)
+
         process_list = []
 
         for number in number_list:
 
-            if not re.search(re_pattern, number):
+            if not number_re.search(number):
                 raise ValueError(
                     f'The string "{number}" does not match the '
                     + f'numbering scheme "{num_scheme}".'
@@ -1115,8 +1096,7 @@ class FileHandler(object):
             else:
                 process_items = [number]
             process_items.extend([
-                self._get_file_name(path, fp, number, ext)
-                for path, fp, ext in zip(path_list, pattern_list, ext_list)
+                f'{prefix}{number}{ext}' for prefix, ext in prefix_ext_list
             ])
             process_list.append(process_items)
 
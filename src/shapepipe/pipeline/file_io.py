@@ -6,6 +6,7 @@ This file contains methods for file I/O handling.
 
 """
 
+import io
 import os
 
 import numpy as np
@@ -466,6 +467,13 @@ class FITSCatalogue(BaseCatalogue):
             info = 'No information'
         return info
 
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @property
     def hdu_no(self):
         """Set HDU Number.
@@ -541,6 +549,30 @@ class FITSCatalogue(BaseCatalogue):
         sex_cat_path : str
             Path to SEXtractor catalogue
 
+        """
+        self._cat_data = self._make_hdu_list(ext_name, s_hdu, sex_cat_path)
+        self._cat_data.writeto(self.fullpath, overwrite=True)
+
+    def _make_hdu_list(self, ext_name=None, s_hdu=True, sex_cat_path=None):
+        """Make HDU List.
+
+        Build in memory the HDU list of an empty catalogue, without writing
+        it to disk.
+
+        Parameters
+        ----------
+        ext_name : str
+            Extension name or number
+        s_hdu : bool
+            If true add a secondary HDU
+        sex_cat_path : str
+            Path to SEXtractor catalogue
+
+        Returns
+        -------
+        astropy.io.fits.HDUList
+            HDU list of the new catalogue
+
         """
         primary_hdu = fits.PrimaryHDU()
         if self._SEx_catalogue:
@@ -548,11 +580,10 @@ class FITSCatalogue(BaseCatalogue):
                 if self._file_exists(sex_cat_path):
                     sex_cat = FITSCatalogue(sex_cat_path, hdu_no=1)
                     sex_cat.open()
-                    secondary_hdu = sex_cat._cat_data[1]
-                    self._cat_data = fits.HDUList([primary_hdu, secondary_hdu])
-                    self._cat_data.writeto(self.fullpath, overwrite=True)
+                    secondary_hdu = sex_cat._cat_data[1].copy()
                     sex_cat.close()
                     del sex_cat
+                    hdu_list = fits.HDUList([primary_hdu, secondary_hdu])
                 else:
                     raise BaseCatalogue.catalogueFileNotFound(sex_cat_path)
             else:
@@ -566,11 +597,11 @@ class FITSCatalogue(BaseCatalogue):
                 header=None,
                 name=ext_name,
             )
-            self._cat_data = fits.HDUList([primary_hdu, secondary_hdu])
-            self._cat_data.writeto(self.fullpath, overwrite=True)
+            hdu_list = fits.HDUList([primary_hdu, secondary_hdu])
         else:
-            self._cat_data = fits.HDUList([primary_hdu])
-            self._cat_data.writeto(self.fullpath, overwrite=True)
+            hdu_list = fits.HDUList([primary_hdu])
+
+        return hdu_list
 
     def copy_hdu(self, fits_file=None, hdu_no=None, hdu_name=None):
         """Copy HDU.
@@ -725,9 +756,9 @@ class FITSCatalogue(BaseCatalogue):
                 names = list(data.keys())
                 it = list(range(len(names)))
                 if len(names) == 1:
-                    data = np.array(data[names[0]])
+                    data = np.asarray(data[names[0]])
                 else:
-                    data = [np.array(data[i]) for i in names]
+                    data = [np.asarray(data[i]) for i in names]
                 self._save_to_fits(
                     data,
                     names,
@@ -1539,6 +1570,9 @@ class FITSCatalogue(BaseCatalogue):
         """
         if col_data is None or len(col_data) == 0:
             col_type = 'D'
+        elif getattr(col_data, 'dtype', None) == np.float32:
+            # Single precision columns are written as such, not upcast to 'D'
+            col_type = 'E'
         elif type(col_data[0]) in [np.int16]:
             col_type = 'I'
         elif type(col_data[0]) in [np.int32]:
@@ -1617,30 +1651,32 @@ class FITSCatalogue(BaseCatalogue):
         if data is None:
             raise ValueError('Data not provided')
 
-        if self._file_exists(self.fullpath) and not overwrite:
+        new_file = not self._file_exists(self.fullpath) or overwrite
+        if not new_file:
             if self._cat_data is None:
                 self.open()
             if ext_name is None:
                 ext_name = 'new'
         else:
+            # Stage the new catalogue in memory, it is written only once
             if self._SEx_catalogue:
-                self.create(s_hdu=False, sex_cat_path=sex_cat_path)
-                self.open()
+                self._cat_data = self._make_hdu_list(
+                    s_hdu=False,
+                    sex_cat_path=sex_cat_path,
+                )
                 if ext_name is None:
                     ext_name = 'LDAC_OBJECTS'
             else:
-                self.create(s_hdu=False)
-                self.open()
+                self._cat_data = self._make_hdu_list(s_hdu=False)
                 if ext_name is None:
                     ext_name = 'new'
 
         if len(names) == 1:
             data = np.array([data])
         col_list = []
-        for idx in it:
+        for name, idx in zip(names, it):
             data_shape = data[idx].shape[1:]
             dim = str(tuple(data_shape))
-            name = names[it.index(idx)]
             data_type = self._get_fits_col_type(data[idx])
             mem_size = 1
             if len(data_shape) != 0:
@@ -1673,7 +1709,25 @@ class FITSCatalogue(BaseCatalogue):
         self._cat_data.append(
             fits.BinTableHDU.from_columns(col_list, name=ext_name)
         )
-        self.close()
+        if new_file:
+            self._write_staged()
+        else:
+            self.close()
+
+    def _write_staged(self):
+        """Write Staged.
+
+        Write to disk a catalogue staged in memory and release it. The FITS
+        file is serialised in memory first, so that it is written to disk with
+        a single call.
+
+        """
+        buffer = io.BytesIO()
+        self._cat_data.writeto(buffer)
+        with open(self.fullpath, 'wb') as fits_file:
+            fits_file.write(buffer.getbuffer())
+        self._cat_data.close()
+        self._cat_data = None
 
     def _save_from_recarray(
         self,
@@ -1710,20 +1764,20 @@ class FITSCatalogue(BaseCatalogue):
             self._cat_data.append(fits.BinTableHDU(data, name=ext_name))
             self.close()
         else:
+            # Stage the new catalogue in memory, it is written only once
             if self._SEx_catalogue:
-                self.create(s_hdu=False, sex_cat_path=sex_cat_path)
-                self.open()
+                self._cat_data = self._make_hdu_list(
+                    s_hdu=False,
+                    sex_cat_path=sex_cat_path,
+                )
                 if ext_name is None:
                     ext_name = 'LDAC_OBJECTS'
-                self._cat_data.append(fits.BinTableHDU(data, name=ext_name))
-                self.close()
             else:
-                self.create(s_hdu=False)
-                self.open()
+                self._cat_data = self._make_hdu_list(s_hdu=False)
                 if ext_name is None:
                     ext_name = 'new'
-                self._cat_data.append(fits.BinTableHDU(data, name=ext_name))
-                self.close()
+            self._cat_data.append(fits.BinTableHDU(data, name=ext_name))
+            self._write_staged()
 
     def _save_image(self, data=None, header=None, overwrite=False):
         """Save Image.
@@ -6,18 +6,21 @@ This module includes functions for handling the distribution of MPI jobs.
 
 """
 
+import numpy as np
+
 from shapepipe.pipeline.worker_handler import WorkerHandler
 
 
 def split_mpi_jobs(jobs, batch_size):
     """Split MPI Jobs.
 
-    Split the number of MPI jobs over the number of processes.
+    Split the number of MPI jobs over the number of processes. Each process
+    is assigned a contiguous block of jobs.
 
     Parameters
     ----------
-    jobs : list
-        List of MPI jobs
+    jobs : numpy.ndarray
+        Array of MPI jobs
     batch_size : int
         Batch size
 
@@ -27,7 +30,7 @@ def split_mpi_jobs(jobs, batch_size):
         Split list of jobs
 
     """
-    return [jobs[_i::batch_size] for _i in range(batch_size)]
+    return np.array_split(jobs, batch_size)
 
 
 def submit_mpi_jobs(
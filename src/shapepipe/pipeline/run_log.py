@@ -6,7 +6,8 @@ This module defines methods for creating a run log.
 
 """
 
-import numpy as np
+import os
+from functools import lru_cache
 
 from shapepipe.pipeline.shared import split_module_run
 
@@ -99,10 +100,37 @@ def get_list(run_log_file):
         Run log file entries
 
     """
-    with open(run_log_file, 'r') as run_log:
-        lines = run_log.readlines()
+    # The cached content is only reused while the file is unchanged
+    stat = os.stat(run_log_file)
+    runs = list(_read_run_log(run_log_file, stat.st_mtime_ns, stat.st_size))
+
+    return runs
+
+
+@lru_cache(maxsize=8)
+def _read_run_log(run_log_file, mtime_ns, size):
+    """Read Run Log.
 
-    runs = [line.rstrip() for line in lines]
+    Read the run log entries. Results are cached for a given file
+    modification time and size.
+
+    Parameters
+    ----------
+    run_log_file : str
+        Run log file name
+    mtime_ns : int
+        File modification time in nanoseconds
+    size : int
+        File size in bytes
+
+    Returns
+    -------
+    tuple
+        Run log file entries
+
+    """
+    with open(run_log_file, 'r') as run_log:
+        runs = tuple(line.rstrip() for line in run_log)
 
     return runs
 
@@ -6,7 +6,9 @@ The module defines functions that can be shared between pipeline modules.
 
 """
 
-from glob import glob
+import fnmatch
+import os
+import re
 
 
 def check_duplicate(input_list):
@@ -81,9 +83,46 @@ def find_files(path, pattern='*', ext='*'):
     if ext != star and not ext.startswith(dot):
         ext = dot + ext
 
-    search_string = f'{path}/**/*{pattern}*{ext}'
+    name_re = re.compile(fnmatch.translate(f'*{pattern}*{ext}'))
+    file_list = []
+    _scan_files(path, name_re, file_list)
 
-    return glob(search_string, recursive=True)
+    return file_list
+
+
+def _scan_files(path, name_re, file_list):
+    """Scan Files.
+
+    Recursively append the paths of entries matching a pattern, in the same
+    order as a recursive ``glob``. Directory entries are read once with
+    ``os.scandir`` and hidden entries are skipped.
+
+    Parameters
+    ----------
+    path : str
+        Directory to scan
+    name_re : re.Pattern
+        Compiled pattern matched against entry names
+    file_list : list
+        List of file names to extend
+
+    """
+    sub_dirs = []
+
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if name_re.match(entry.name):
+                    file_list.append(entry.path)
+                if entry.is_dir():
+                    sub_dirs.append(entry.path)
+    except OSError:
+        return
+
+    for sub_dir in sub_dirs:
+        _scan_files(sub_dir, name_re, file_list)
 
 
 def split_module_run(module_str):
@@ -119,9 +119,10 @@ class WorkerHandler(object):
         """
         self.worker_dict['pid'] = getpid()
         self.worker_dict['threads'] = active_count()
-        self.worker_dict['node'] = platform.node()
-        self.worker_dict['system'] = platform.system()
-        self.worker_dict['machine'] = platform.machine()
+        uname = platform.uname()
+        self.worker_dict['node'] = uname.node
+        self.worker_dict['system'] = uname.system
+        self.worker_dict['machine'] = uname.machine
         self.worker_dict['exception'] = False
         self.worker_dict['stderr'] = False
         self.worker_dict['process'] = list(process)
@@ -147,23 +147,20 @@ class ShapePipe():
         """
         prop_list = []
 
-        module_runners = self.filehd.module_runners
+        prop_upper = property.upper()
 
-        for module in module_runners.keys():
+        for module, runner in self.filehd.module_runners.items():
 
-            if self.config.has_option(module.upper(), property.upper()):
-                prop_list += self.config.getlist(
-                    module.upper(),
-                    property.upper(),
-                )
+            module_upper = module.upper()
+
+            if self.config.has_option(module_upper, prop_upper):
+                prop_list += self.config.getlist(module_upper, prop_upper)
             else:
-                prop_list += getattr(module_runners[module], property)
+                prop_list += getattr(runner, property)
 
-            if self.filehd.get_add_module_property(module, property):
-                prop_list += self.filehd.get_add_module_property(
-                    module,
-                    property,
-                )
+            add_prop = self.filehd.get_add_module_property(module, property)
+            if add_prop:
+                prop_list += add_prop
 
         return prop_list
 
@@ -363,18 +360,13 @@ def run_mpi(pipe, comm):
     # Assign master node
     master = comm.rank == 0
 
-    # Get the module to be run
-    modules = pipe.modules if master else None
-    modules = comm.bcast(modules, root=0)
-
-    # Get ShapePipe objects
+    # Get the modules to be run and ShapePipe objects, broadcast together in
+    # a single collective call
     if master:
-        config = pipe.config
-        verbose = pipe.verbose
+        shared = (pipe.modules, pipe.config, pipe.verbose)
     else:
-        config = verbose = None
-    config = comm.bcast(config, root=0)
-    verbose = comm.bcast(verbose, root=0)
+        shared = None
+    modules, config, verbose = comm.bcast(shared, root=0)
 
     # Loop through modules to be run
     for module in modules:
@@ -421,12 +413,11 @@ def run_mpi(pipe, comm):
 
         if job_type == 'parallel':
 
-            # Broadcast objects to all nodes
-            run_dirs = comm.bcast(run_dirs, root=0)
-
-            module_runner = comm.bcast(module_runner, root=0)
-            worker_log = comm.bcast(worker_log, root=0)
-            timeout = comm.bcast(timeout, root=0)
+            # Broadcast objects to all nodes in a single collective call
+            run_dirs, module_runner, worker_log, timeout = comm.bcast(
+                (run_dirs, module_runner, worker_log, timeout),
+                root=0,
+            )
             jobs = comm.scatter(jobs, root=0)
 
             # Submit the MPI jobs and gather results
@@ -6,10 +6,14 @@ This module contains unit tests for the shapepipe.pipeline module.
 
 """
 
+import os
+import shutil
+import tempfile
 from unittest import TestCase
 
 import numpy as np
 import numpy.testing as npt
+from astropy.io import fits
 
 from shapepipe.pipeline import *
 
@@ -36,3 +40,57 @@ class ExecuteTestCase(TestCase):
         npt.assert_raises(TypeError, execute.check_executable, 1)
         npt.assert_raises(OSError, execute.check_executable, '')
         self.assertIsNone(execute.check_executable('/bin/ls'))
+
+
+class FITSCatalogueTestCase(TestCase):
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cat_path = os.path.join(self.tmp_dir, 'cat.fits')
+        self.data = {
+            'FLOAT32': np.arange(3, dtype=np.float32),
+            'FLOAT64': np.arange(3, dtype=np.float64),
+            'VIGNET': np.ones((3, 2, 2), dtype=np.float32),
+            'INT64': np.arange(3, dtype=np.int64),
+        }
+        self.formats_exp = {
+            'FLOAT32': '1E',
+            'FLOAT64': '1D',
+            'VIGNET': '4E',
+            'INT64': '1K',
+        }
+
+    def tearDown(self):
+
+        shutil.rmtree(self.tmp_dir)
+        self.tmp_dir = None
+        self.cat_path = None
+        self.data = None
+        self.formats_exp = None
+
+    def test_save_as_fits_column_formats(self):
+
+        cat = file_io.FITSCatalogue(
+            self.cat_path,
+            open_mode=file_io.BaseCatalogue.OpenMode.ReadWrite,
+        )
+        cat.save_as_fits(self.data)
+
+        with fits.open(self.cat_path) as hdu_list:
+            formats = {
+                col.name: str(col.format) for col in hdu_list[1].columns
+            }
+            saved = hdu_list[1].data
+
+            npt.assert_equal(
+                formats,
+                self.formats_exp,
+                err_msg='save_as_fits wrote unexpected column formats',
+            )
+            for name, col_data in self.data.items():
+                npt.assert_array_equal(
+                    saved[name],
+                    col_data,
+                    err_msg=f'save_as_fits changed the values of {name}',
+                )
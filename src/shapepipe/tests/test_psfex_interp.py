@@ -0,0 +1,122 @@
+"""UNIT TESTS FOR MODULE PACKAGE: PSFEX_INTERP.
+
+This module contains unit tests for the module package
+shapepipe.modules.psfex_interp_package.psfex_interp
+
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import numpy as np
+import numpy.testing as npt
+
+from shapepipe.modules.psfex_interp_package import psfex_interp
+from shapepipe.pipeline import file_io
+
+
+class PSFExInterpTestCase(TestCase):
+
+    def setUp(self):
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dotpsf_path = os.path.join(self.tmp_dir, 'star.psf')
+        self.galcat_path = os.path.join(self.tmp_dir, 'galaxy.fits')
+        self.output_file = os.path.join(self.tmp_dir, 'galaxy_psf-0.fits')
+
+        galcat = file_io.FITSCatalogue(
+            self.galcat_path,
+            open_mode=file_io.BaseCatalogue.OpenMode.ReadWrite,
+        )
+        galcat.save_as_fits({
+            'XWIN_IMAGE': np.arange(3, dtype=float),
+            'YWIN_IMAGE': np.arange(3, dtype=float),
+        })
+        open(self.dotpsf_path, 'w').close()
+
+        self.w_log = mock.Mock()
+
+    def tearDown(self):
+
+        shutil.rmtree(self.tmp_dir)
+        self.tmp_dir = None
+        self.dotpsf_path = None
+        self.galcat_path = None
+        self.output_file = None
+        self.w_log = None
+
+    def _get_interpolator(self):
+
+        interp = psfex_interp.PSFExInterpolator(
+            self.dotpsf_path,
+            self.galcat_path,
+            self.tmp_dir,
+            '-0',
+            self.w_log,
+            pos_params=['XWIN_IMAGE', 'YWIN_IMAGE'],
+            get_shapes=False,
+        )
+        # The test catalogue is not in SExtractor format
+        interp._get_galaxy_positions = mock.Mock()
+
+        return interp
+
+    def _write_output(self):
+
+        # Set the output time explicitly, filesystem mtime resolution can be
+        # as coarse as a few seconds
+        open(self.output_file, 'w').close()
+        output_time = max(
+            os.path.getmtime(self.dotpsf_path),
+            os.path.getmtime(self.galcat_path),
+        ) + 10
+        os.utime(self.output_file, (output_time, output_time))
+
+    def _logged(self):
+
+        return ' '.join(
+            call.args[0] for call in self.w_log.info.call_args_list
+        )
+
+    def test_output_up_to_date(self):
+
+        interp = self._get_interpolator()
+
+        npt.assert_equal(
+            interp._output_up_to_date(),
+            False,
+            err_msg='missing output reported as up to date',
+        )
+
+        self._write_output()
+
+        npt.assert_equal(
+            interp._output_up_to_date(),
+            True,
+            err_msg='recent output not reported as up to date',
+        )
+
+    def test_missing_input(self):
+
+        interp = self._get_interpolator()
+        self._write_output()
+        os.remove(self.dotpsf_path)
+
+        npt.assert_equal(
+            interp._output_up_to_date(),
+            False,
+            err_msg='output reported as up to date with a missing input',
+        )
+
+        for force in (False, True):
+            self.w_log.reset_mock()
+            interp.interp_PSFs = None
+            interp.process(force=force)
+            npt.assert_equal(
+                interp.interp_PSFs,
+                psfex_interp.FILE_NOT_FOUND,
+                err_msg=f'missing PSF file not detected for force={force}',
+            )
+            self.assertIn('not found', self._logged())
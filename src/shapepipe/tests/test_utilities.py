@@ -11,7 +11,7 @@ from unittest import TestCase
 import numpy as np
 import numpy.testing as npt
 
-from shapepipe.utilities import galaxy
+from shapepipe.utilities import cfis, galaxy
 
 
 class GalaxyTestCase(TestCase):
@@ -92,3 +92,69 @@ class GalaxyTestCase(TestCase):
             self.sigma_float,
             -self.pixel_scale,
         )
+
+
+class CfisTestCase(TestCase):
+
+    def setUp(self):
+
+        self.images = [
+            cfis.image('valid.fits', None, None, exp_time=200, valid='V'),
+            cfis.image('unknown.fits', None, None, exp_time=200),
+            cfis.image('invalid.fits', None, None, exp_time=200, valid='F'),
+            cfis.image('short.fits', None, None, exp_time=50, valid='V'),
+            cfis.image('no_time.fits', None, None, valid='V'),
+            cfis.image('short_unknown.fits', None, None, exp_time=50),
+        ]
+        self.cut_exp = np.array([False, False, True, True, False, True])
+
+    def tearDown(self):
+
+        self.images = None
+        self.cut_exp = None
+
+    def test_image_table_cut_mask(self):
+
+        table = cfis.ImageTable.from_images(self.images)
+
+        npt.assert_array_equal(
+            [img.cut() for img in self.images],
+            self.cut_exp,
+            err_msg='image.cut gave invalid result',
+        )
+
+        npt.assert_array_equal(
+            table.cut_mask(),
+            [img.cut() for img in self.images],
+            err_msg='ImageTable.cut_mask does not match image.cut',
+        )
+
+        npt.assert_array_equal(
+            table.cut_mask(no_cuts=True),
+            [img.cut(no_cuts=True) for img in self.images],
+            err_msg=(
+                'ImageTable.cut_mask does not match image.cut with no_cuts'
+            ),
+        )
+
+    def test_image_table_select(self):
+
+        table = cfis.ImageTable.from_images(self.images)
+
+        npt.assert_array_equal(
+            table[~table.cut_mask()].names,
+            [img.name for img in self.images if not img.cut()],
+            err_msg='ImageTable selection does not match image.cut',
+        )
+
+    def test_image_table_as_image_objects(self):
+
+        images = cfis.ImageTable.from_images(self.images).as_image_objects()
+
+        npt.assert_equal(
+            [(img.name, img.ra, img.dec, img.exp_time, img.valid)
+             for img in images],
+            [(img.name, img.ra, img.dec, img.exp_time, img.valid)
+             for img in self.images],
+            err_msg='ImageTable.as_image_objects does not return the images',
+        )
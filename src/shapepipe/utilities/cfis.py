@@ -6,10 +6,10 @@ CFIS module.
 
 """
 
-import glob
 import os
 import re
 import sys
+from functools import lru_cache
 
 import astropy.coordinates as coords
 import numpy as np
@@ -30,6 +30,16 @@ size['exposure'] = 1.0
 exp_time_min = 95
 flag_valid = 'V'
 
+# Integer codes of validation flags used by ImageTable
+valid_code_unknown = 0
+valid_code_valid = 1
+valid_code_invalid = 2
+
+# Pre-compiled patterns of image IDs and tile numbers
+_RE_ID = re.compile(r'(\d{3}).{1}(\d{3})')
+_RE_ID_ONLY = re.compile(r'\d{3}.\d{3}')
+_RE_TILE_NUMBER = re.compile(r'(\d{3})[\.-](\d{3})')
+
 
 class param:
     """Param Class.
@@ -140,7 +150,7 @@ class image():
             if name does not match to ID pattern
 
         """
-        m = re.search(r'(\d{3}).{1}(\d{3})', self.name)
+        m = _RE_ID.search(self.name)
         if m is None:
             raise ValueError(f'No ID match in file name {name}')
         else:
@@ -180,22 +190,21 @@ class image():
             name = self.name
 
         if ID_only:
-            m = re.search(r'\d{3}.\d{3}', name)
+            m = _RE_ID_ONLY.search(name)
             if m is None:
                 raise ValueError(f'No ID match in file name {name}')
             else:
                 name = m[0]
-        print(name, end='', file=file)
 
         if not name_only:
             if self.ra is not None:
                 ra_unit = getattr(self.ra, unitdef)
-                print(f' {ra_unit:10.2f}', end='', file=file)
+                name += f' {ra_unit:10.2f}'
             if self.dec is not None:
                 dec_unit = getattr(self.dec, unitdef)
-                print(f' {dec_unit:10.2f}', end='', file=file)
-            print(f' {self.exp_time:5d} {self.valid:8s}', end='', file=file)
-        print(file=file)
+                name += f' {dec_unit:10.2f}'
+            name += f' {self.exp_time:5d} {self.valid:8s}'
+        print(name, file=file)
 
     def print_header(self, file=sys.stdout):
         """Print Header.
@@ -214,6 +223,196 @@ class image():
         )
 
 
+class ImageTable():
+    """Image Table Class.
+
+    Class to store the information of several images, with one array per
+    quantity. This allows vectorised selections instead of loops over
+    :class:`image` objects.
+
+    Parameters
+    ----------
+    names : numpy.ndarray of str
+        file names
+    ra_deg : numpy.ndarray of float
+        right ascensions in degree, NaN if unknown
+    dec_deg : numpy.ndarray of float
+        declinations in degree, NaN if unknown
+    exp_time : numpy.ndarray of int
+        exposure times, -1 if unknown
+    valid : numpy.ndarray of str
+        validation flags
+
+    """
+
+    def __init__(self, names, ra_deg, dec_deg, exp_time, valid):
+        self.names = np.asarray(names, dtype=str)
+        self.ra_deg = np.asarray(ra_deg, dtype=float)
+        self.dec_deg = np.asarray(dec_deg, dtype=float)
+        self.exp_time = np.asarray(exp_time, dtype=int)
+        self.valid = np.asarray(valid, dtype=str)
+
+        # Encode validation flags once, selections compare small integers
+        self.valid_code = np.full(
+            len(self.valid),
+            valid_code_invalid,
+            dtype=np.int8,
+        )
+        self.valid_code[self.valid == flag_valid] = valid_code_valid
+        self.valid_code[self.valid == 'Unknown'] = valid_code_unknown
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, key):
+        """Get Item.
+
+        Return the sub-table selected by an index, slice or mask, e.g.
+        ``table[~table.cut_mask()]``.
+
+        """
+        return ImageTable(
+            self.names[key],
+            self.ra_deg[key],
+            self.dec_deg[key],
+            self.exp_time[key],
+            self.valid[key],
+        )
+
+    @classmethod
+    def from_images(cls, images):
+        """From Images.
+
+        Create an image table from a list of images.
+
+        Parameters
+        ----------
+        images : list of image
+            images
+
+        Returns
+        -------
+        ImageTable
+            image table
+
+        """
+        return cls(
+            [img.name for img in images],
+            [np.nan if img.ra is None else img.ra.degree for img in images],
+            [np.nan if img.dec is None else img.dec.degree for img in images],
+            [img.exp_time for img in images],
+            [img.valid for img in images],
+        )
+
+    def cut_mask(self, no_cuts=False):
+        """Cut Mask.
+
+        Return mask of images that need to be cut from selection, see
+        :meth:`image.cut`.
+
+        Parameters
+        ----------
+        no_cuts : bool, optiona, default=False
+            do not cut if True
+
+        Returns
+        -------
+        numpy.ndarray of bool
+            True (False) if image is (not) cut
+
+        """
+        if no_cuts:
+            return np.zeros(len(self), dtype=bool)
+
+        short_exposure = (
+            (self.exp_time < exp_time_min) & (self.exp_time != -1)
+        )
+        not_valid = self.valid_code == valid_code_invalid
+
+        return short_exposure | not_valid
+
+    def print(
+        self,
+        file=sys.stdout,
+        base_name=False,
+        name_only=True,
+        ID_only=False
+    ):
+        """Print.
+
+        Print information of all images as ascii Table columns, in a single
+        write, see :meth:`image.print`.
+
+        Parameters
+        ----------
+        file : file, optional, default=sys.stdout
+            output file handle
+        base_name : bool, optional, default=False
+            if True (False), print image base name (full path)
+        name_only : bool, optional, default=False
+            if True, do not print metainfo
+        ID_only : bool, optional, default=False
+            if True, only print file ID instead of entire name
+
+        Raises
+        ------
+        ValueError
+            if name does not match to ID pattern
+
+        """
+        lines = []
+        for idx, name in enumerate(self.names):
+            if base_name:
+                name = os.path.basename(name)
+
+            if ID_only:
+                m = _RE_ID_ONLY.search(name)
+                if m is None:
+                    raise ValueError(f'No ID match in file name {name}')
+                else:
+                    name = m[0]
+
+            if not name_only:
+                if not np.isnan(self.ra_deg[idx]):
+                    name += f' {self.ra_deg[idx]:10.2f}'
+                if not np.isnan(self.dec_deg[idx]):
+                    name += f' {self.dec_deg[idx]:10.2f}'
+                name += f' {self.exp_time[idx]:5d} {self.valid[idx]:8s}'
+            lines.append(f'{name}\n')
+
+        file.write(''.join(lines))
+
+    def as_image_objects(self):
+        """As Image Objects.
+
+        Return the table as list of images, for legacy callers that expect
+        :class:`image` objects.
+
+        Returns
+        -------
+        list of image
+            images
+
+        """
+        ra = coords.Angle(self.ra_deg, unit=unitdef)
+        dec = coords.Angle(self.dec_deg, unit=unitdef)
+
+        images = []
+        for idx in range(len(self)):
+            has_coord = not (
+                np.isnan(self.ra_deg[idx]) or np.isnan(self.dec_deg[idx])
+            )
+            images.append(image(
+                str(self.names[idx]),
+                ra[idx] if has_coord else None,
+                dec[idx] if has_coord else None,
+                exp_time=int(self.exp_time[idx]),
+                valid=str(self.valid[idx]),
+            ))
+
+        return images
+
+
 def log_command(argv, name=None, close_no_return=True):
     """Log Command.
 
@@ -246,16 +445,16 @@ def log_command(argv, name=None, close_no_return=True):
     else:
         f = open(name, 'w')
 
+    args = []
     for a in argv:
 
         # Quote argument if special characters
         if ']' in a or ']' in a:
             a = f'\"{a}\"'
 
-        print(a, end='', file=f)
-        print(' ', end='', file=f)
+        args.append(f'{a} ')
 
-    print('', file=f)
+    print(''.join(args), file=f)
 
     if not close_no_return:
         return f
@@ -338,7 +537,15 @@ def my_string_split(string, num=-1, verbose=False, stop=False, sep=None):
     return res
 
 
-def get_file_pattern(pattern, band, image_type, want_re=True, ext=True):
+@lru_cache(maxsize=128)
+def get_file_pattern(
+    pattern,
+    band,
+    image_type,
+    want_re=True,
+    ext=True,
+    compiled=False,
+):
     """Get File Pattern.
 
     Return file pattern of CFIS image file.
@@ -357,10 +564,12 @@ def get_file_pattern(pattern, band, image_type, want_re=True, ext=True):
         return regular expression if True
     ext : bool, optional, default=True
         if True add file extention to pattern
+    compiled : bool, optional, default=False
+        if True return the compiled regular expression
 
     Returns
     -------
-    str
+    str or re.Pattern
         output pattern
 
     """
@@ -405,6 +614,9 @@ def get_file_pattern(pattern, band, image_type, want_re=True, ext=True):
     if not want_re:
         pattern_out = pattern_out.replace('\\', '')
 
+    if compiled:
+        return re.compile(pattern_out)
+
     return pattern_out
 
 
@@ -434,17 +646,54 @@ def get_tile_number_from_coord(ra, dec, return_type=str):
         tile number for x and tile number for y
 
     """
-    y = (dec.degree + 90) * 2.0
-    yi = int(np.rint(y))
+    nix, niy = get_tile_number_from_coord_arr(
+        ra.degree,
+        dec.degree,
+        return_type=return_type,
+    )
+
+    return nix.item(), niy.item()
+
+
+def get_tile_number_from_coord_arr(ra_deg, dec_deg, return_type=int):
+    """Get Tile Number From Coord Arr.
+
+    Return CFIS stacked image tile numbers covering arrays of input
+    coordinates.
+
+    Parameters
+    ----------
+    ra_deg : numpy.ndarray
+        right ascension in degree
+    dec_deg : numpy.ndarray
+        declination in degree
+    return type : <type 'type'>
+        return type, int or str
+
+    Raises
+    ------
+    CfisError
+        for invalid return type
+
+    Returns
+    -------
+    tuple
+        tile numbers for x and tile numbers for y
+
+    """
+    ra_deg = np.asarray(ra_deg, dtype=float)
+    dec_deg = np.asarray(dec_deg, dtype=float)
+
+    y = (dec_deg + 90) * 2.0
+    yi = np.rint(y).astype(int)
 
-    x = ra.degree * np.cos(dec.radian) * 2.0
-    xi = int(np.rint(x))
-    if xi == 720:
-        xi = 0
+    x = ra_deg * np.cos(np.radians(dec_deg)) * 2.0
+    xi = np.rint(x).astype(int)
+    xi = np.where(xi == 720, 0, xi)
 
     if return_type == str:
-        nix = f'{xi:03d}'
-        niy = f'{yi:03d}'
+        nix = np.char.mod('%03d', xi)
+        niy = np.char.mod('%03d', yi)
     elif return_type == int:
         nix = xi
         niy = yi
@@ -567,7 +816,7 @@ def get_tile_number(tile_name):
         tile number for x and tile number for y
 
     """
-    m = re.search(r'(\d{3})[\.-](\d{3})', tile_name)
+    m = _RE_TILE_NUMBER.search(tile_name)
     if m is None or len(m.groups()) != 2:
         raise CfisError(
             f'Image name \'{tile_name}\' does not match tile name syntax'
@@ -628,19 +877,42 @@ def get_log_file(path, verbose=False):
         log file lines
 
     """
-    if not os.path.isfile(path):
-        raise CfisError(f'Log file \'{path}\' not found')
-
-    f_log = open(path, 'r')
-    log = f_log.readlines()
+    log = list(iter_log_file(path))
     if verbose:
         print(f'Reading log file, {len(log)} lines found')
-    f_log.close()
 
     return log
 
 
-def check_ra(ra):
+def iter_log_file(path):
+    """Iter Log File.
+
+    Iterate over log file lines, without holding the entire file in memory.
+
+    Parameters
+    ----------
+    path : str
+        log file path
+
+    Raises
+    ------
+    CfisError
+        if input path does not exist
+
+    Yields
+    ------
+    str
+        log file line
+
+    """
+    if not os.path.isfile(path):
+        raise CfisError(f'Log file \'{path}\' not found')
+
+    with open(path, 'r') as f_log:
+        yield from f_log
+
+
+def check_ra(ra, verbose=False):
     """Check RA.
 
     Range check of right ascension.
@@ -648,7 +920,9 @@ def check_ra(ra):
     Parameters
     ----------
     ra : Angle
-        right ascension
+        right ascension, can be an array
+    verbose : bool, optional, default=False
+        verbose output if True
 
     Raises
     ------
@@ -661,8 +935,10 @@ def check_ra(ra):
         result of check (True if pass, False if fail)
 
     """
-    print(ra.deg)
-    if ra.deg < 0 or ra.deg > 360:
+    ra_deg = np.asarray(ra.deg)
+    if verbose:
+        print(ra_deg)
+    if np.any(ra_deg < 0) or np.any(ra_deg > 360):
         raise CfisError('Invalid ra, valid range is 0 < ra < 360 deg')
         return 1
 
@@ -774,8 +1050,8 @@ def read_list(fname, col=None):
     ----------
     fname : str
         ascii file name
-    col : str, optional, default=None
-        column name
+    col : str or int, optional, default=None
+        column number, read all lines as names if None
 
     Returns
     -------
@@ -783,16 +1059,13 @@ def read_list(fname, col=None):
         list of file names
 
     """
-    if col is None:
-        f = open(fname, 'rU', encoding='latin1')
-        file_list = [x.strip() for x in f.readlines()]
-        f.close()
-    else:
-        import pandas as pd
-        dat = pd.read_csv(fname, sep=r'\s+', dtype='string', header=None)
-        if col not in dat:
+    with open(fname, 'r', encoding='latin1') as f:
+        if col is None:
+            file_list = [x.strip() for x in f]
+        else:
+            # Whitespace-separated columns without header
             col = int(col)
-        file_list = dat[col]
+            file_list = [x.split()[col] for x in f if not x.isspace()]
 
     file_list.sort()
 
@@ -833,11 +1106,16 @@ def create_image_list(fname, ra, dec, exp_time=[], valid=[]):
             f'Lists fname, ra, dec have not same length ({nf}, {nr}, {nd})'
         )
 
+    # Convert all coordinates at once
+    if nr > 0 and nd > 0:
+        ra_all = coords.Angle(np.asarray(ra), unit=unitdef)
+        dec_all = coords.Angle(np.asarray(dec), unit=unitdef)
+
     images = []
     for i in range(nf):
         if nr > 0 and nd > 0:
-            r = Angle(f'{ra[i]} {unitdef}')
-            d = Angle(f'{dec[i]} {unitdef}')
+            r = ra_all[i]
+            d = dec_all[i]
         else:
             r = None
             d = None
@@ -888,6 +1166,24 @@ def get_image_list(
         image list
 
     """
+    # Pattern of CFIS image file names
+    if input_format == 'ID_only':
+        pattern = get_file_pattern(
+            r'\d{3}.\d{3}',
+            band,
+            image_type,
+            ext=False,
+            compiled=True,
+        )
+    else:
+        pattern = get_file_pattern(
+            rf'CFIS.\d{{3}}.\d{{3}}\.{band}',
+            band,
+            image_type,
+            compiled=True,
+        )
+
+    inp_type = None
     file_list = []
     ra_list = []
     dec_list = []
@@ -900,9 +1196,18 @@ def get_image_list(
                 'Column name (-c option) only valid if input is file'
             )
 
-        # Read file names from directory listing
+        # Read and filter file names from directory listing in one pass,
+        # using the link source name for symbolic links
         inp_type = 'dir'
-        file_list = glob.glob(f'{os.path.abspath(inp)}/*')
+        with os.scandir(os.path.abspath(inp)) as entries:
+            file_list = [
+                entry.path for entry in entries
+                if not entry.name.startswith('.')
+                and pattern.search(
+                    os.readlink(entry.path) if entry.is_symlink()
+                    else entry.path
+                )
+            ]
 
     elif os.path.isfile(inp):
         if image_type in ('tile', 'weight', 'weight.fz'):
@@ -925,17 +1230,15 @@ def get_image_list(
                 # http://www.cfht.hawaii.edu/Science/CFIS-DATA
                 #  /logs/MCLOG-CFIS.r.qso-elx.log
                 # Default file separator is '|'
-                for d in dat:
-                    file_list.append(f'd{d["col1"]}p.fits.fz')
-                    ra = re.split(r'\s*', d['col4'])[0]
-                    dec = re.split(r'\s*', d['col4'])[1]
-                    ang = coords.Angle('{ra} hours')
-                    ra_list.append(ang.degree)
-                    dec_list.append(dec)
-                    exp_time = int(d['col5'])
-                    exp_time_list.append(exp_time)
-                    valid = re.split(r'\s*', d['col11'])[2]
-                    valid_list.append(valid)
+                # Process entire columns, with a single coordinate
+                # conversion for all ra values
+                file_list = [f'd{exp}p.fits.fz' for exp in dat['col1']]
+                ra_str, dec_list = zip(
+                    *(str(coord).split()[:2] for coord in dat['col4'])
+                )
+                ra_list = coords.Angle(list(ra_str), unit='hourangle').degree
+                exp_time_list = np.asarray(dat['col5'], dtype=int)
+                valid_list = [str(flag).split()[2] for flag in dat['col11']]
             else:
                 raise CfisError(
                     f'Wrong file format, #columns={len(dat.keys())},'
@@ -944,39 +1247,29 @@ def get_image_list(
         else:
             raise CfisError(f'Image type \'{image_type}\' not supported')
 
-    # Create list of objects, coordinate lists can be empty
-    image_list = create_image_list(
-        file_list,
-        ra_list,
-        dec_list,
-        exp_time=exp_time_list,
-        valid=valid_list
-    )
-
-    # Filter file list to match CFIS image pattern
-    img_list = []
-    if input_format == 'ID_only':
-        pattern = get_file_pattern(r'\d{3}.\d{3}', band, image_type, ext=False)
+    if inp_type == 'dir':
+        # Directory listing is already filtered, no coordinates
+        img_list = [image(name, None, None) for name in file_list]
     else:
-        pattern = get_file_pattern(
-            rf'CFIS.\d{{3}}.\d{{3}}\.{band}',
-            band,
-            image_type
+        # Create list of objects, coordinate lists can be empty
+        image_list = create_image_list(
+            file_list,
+            ra_list,
+            dec_list,
+            exp_time=exp_time_list,
+            valid=valid_list
         )
 
-    for img in image_list:
-
-        # Get link source name if symbolic link
-        try:
-            link_src = os.readlink(img.name)
-            name = link_src
-        except Exception:
-            # No link, continue
-            name = img.name
-
-        m = re.findall(pattern, name)
-        if len(m) != 0:
-            img_list.append(img)
+        # Filter file list to match CFIS image pattern, use link source name
+        # for symbolic links
+        names = [
+            os.readlink(img.name) if os.path.islink(img.name) else img.name
+            for img in image_list
+        ]
+        img_list = [
+            img for img, name in zip(image_list, names)
+            if pattern.search(name)
+        ]
 
     if verbose and len(img_list) > 0:
         print(
@@ -995,8 +1288,9 @@ def exclude(f, exclude_list):
     ----------
     f : str
         file name
-    exclude_list : list of str
-        list of files
+    exclude_list : set or list of str
+        files to exclude, a set built once by the caller gives constant-time
+        lookups when called in a loop over files
 
     Returns
     -------
@@ -1093,20 +1387,29 @@ def find_image_at_coord(
 
     elif image_type == 'exposure':
         sc_input = coords.SkyCoord(ra, dec)
+        table = ImageTable.from_images(images)
+        n_img = len(table)
+
+        # Check distance along ra and dec from image centers
+        sc_img_same_ra = coords.SkyCoord(
+            np.full(n_img, ra.degree),
+            table.dec_deg,
+            unit=unitdef,
+        )
+        sc_img_same_dec = coords.SkyCoord(
+            table.ra_deg,
+            np.full(n_img, dec.degree),
+            unit=unitdef,
+        )
+        distance_ra = sc_input.separation(sc_img_same_dec).degree
+        distance_dec = sc_input.separation(sc_img_same_ra).degree
+        found = (
+            (distance_ra < size[image_type] / 2)
+            & (distance_dec < size[image_type] / 2)
+            & ~table.cut_mask(no_cuts=no_cuts)
+        )
 
-        img_found = []
-        for img in images:
-            # Check distance along ra and dec from image center
-            sc_img_same_ra = coords.SkyCoord(ra, img.dec)
-            sc_img_same_dec = coords.SkyCoord(img.ra, dec)
-            distance_ra = sc_input.separation(sc_img_same_dec)
-            distance_dec = sc_input.separation(sc_img_same_ra)
-            if (
-                distance_ra.degree < size[image_type] / 2
-                and distance_dec.degree < size[image_type] / 2
-            ):
-                if not img.cut(no_cuts=no_cuts):
-                    img_found.append(img)
+        img_found = [images[idx] for idx in np.flatnonzero(found)]
 
         if len(img_found) != 0:
             pass
@@ -1180,24 +1483,25 @@ def find_images_in_area(
         print()
 
     if image_type in ('tile', 'weight', 'weight.fz'):
-        for img in images:
-            nix, niy = get_tile_number(img.name)
-            ra, dec = get_tile_coord_from_nixy(nix, niy)
+        # Get coordinates of all tiles at once
+        nix, niy = get_tile_number_list([img.name for img in images])
+        ra, dec = get_tile_coord_from_nixy(nix, niy)
 
-            if dec.is_within_bounds(angles[0].dec, angles[1].dec):
-                within = False
+        within = (angles[0].dec <= dec) & (dec < angles[1].dec)
 
-                # Check whether image is in any of the ra bound pairs
-                for (ra_min, ra_max) in ra_bounds:
-                    if ra.is_within_bounds(ra_min, ra_max):
-                        within = True
-                        break
-                if within:
-                    if img.ra is None or img.dec is None:
-                        img.ra = ra
-                        img.dec = dec
+        # Check whether images are in any of the ra bound pairs
+        within_ra = np.zeros(len(images), dtype=bool)
+        for (ra_min, ra_max) in ra_bounds:
+            within_ra |= (ra_min <= ra) & (ra < ra_max)
+        within &= within_ra
+
+        for idx in np.flatnonzero(within):
+            img = images[idx]
+            if img.ra is None or img.dec is None:
+                img.ra = ra[idx]
+                img.dec = dec[idx]
 
-                    found.append(img)
+            found.append(img)
 
     elif image_type == 'exposure':
         for img in images: